@@ -0,0 +1,314 @@
+"""Headless benchmarks for the Data Visualizer load and render paths.
+
+Synthetic datasets are generated once per size and format, then each stage is timed
+on its own: parsing the file, the chart aggregations, drawing (artists, tight_layout
+and an Agg canvas draw) and exporting the figure the way save_chart does, through
+a pickled snapshot. Peak memory is recorded with tracemalloc in a separate pass so
+that tracing does not skew the timings.
+
+    python benchmark.py --sizes 10000 100000 1000000 --formats csv json
+    python benchmark.py --update-baseline          # record the current numbers
+    python benchmark.py                            # compare against the baseline
+
+The run exits with status 1 when a stage fails, or is slower or larger than its
+baseline by more than the thresholds.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+import pandas as pd
+import seaborn  # noqa: F401  imported up front so the first Heatmap draw is not charged for it
+
+from data_vis import (CHART_OPTION_DEFAULTS, HAS_PYARROW, compute_directly, draw_chart, export_figure,
+                      figure_snapshot, read_data_file, style_chart)
+
+DEFAULT_SIZES = [10_000, 100_000]
+FORMATS = {'csv': '.csv', 'txt': '.txt', 'json': '.json', 'xlsx': '.xlsx',
+           'parquet': '.parquet', 'feather': '.feather', 'npy': '.npy'}
+PYARROW_FORMATS = ('parquet', 'feather')
+# NPY files hold one structured array; strings are fixed width so that no pickling is needed
+NPY_DTYPE = np.dtype([('id', 'i8'), ('value', 'f8'), ('ratio', 'f8'), ('count', 'i8'), ('category', 'U8'),
+                      ('label', 'U16'), ('when', 'M8[ns]'), ('flag', '?')])
+FORMAT_MAX_ROWS = {'xlsx': 1_000_000, 'json': 10_000_000}
+GENERATE_CHUNK_ROWS = 1_000_000
+EXPORT_FORMATS = ['png']
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".data_visualizer", "bench")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+TIME_THRESHOLD = 0.25
+MEMORY_THRESHOLD = 0.25
+MIN_SECONDS = 0.05
+MIN_PEAK_MB = 1.0
+
+CHART_COLUMNS = {
+    "Bar": ("category", "value"),
+    "Line": ("when", "value"),
+    "Pie": ("category", ""),
+    "Scatter": ("value", "ratio"),
+    "Histogram": ("value", ""),
+    "Boxplot": ("value", ""),
+    "Heatmap": ("value", ""),
+    "Density": ("value", "ratio"),
+}
+# Benchmark cases that are a chart type drawn with other options
+CHART_VARIANTS = {"Density": ("Heatmap", {'correlation': False})}
+
+def synthetic_chunk(start, rows, total_rows, rng):
+    """Rows start..start+rows of the synthetic dataset, mixing dtypes and cardinalities"""
+    ids = np.arange(start, start + rows)
+    return pd.DataFrame({
+        'id': ids,
+        'value': rng.normal(100.0, 15.0, rows),
+        'ratio': rng.random(rows).round(3),
+        'count': rng.integers(0, 1000, rows),
+        'category': rng.choice([f"cat_{i}" for i in range(12)], rows),
+        'label': [f"item_{i}" for i in rng.integers(0, max(total_rows // 10, 1), rows)],
+        'when': pd.Timestamp("2020-01-01") + pd.to_timedelta(ids, unit='s'),
+        'flag': rng.random(rows) < 0.3,
+    })
+
+def generate_dataset(rows, fmt, data_dir=DATA_DIR):
+    """Write the synthetic dataset of the given size and format unless it already exists"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"bench_{rows}{FORMATS[fmt]}")
+    if os.path.exists(path):
+        return path
+
+    rng = np.random.default_rng(rows)
+    partial = os.path.join(data_dir, f"bench_{rows}.partial{FORMATS[fmt]}")
+    chunks = (synthetic_chunk(start, min(GENERATE_CHUNK_ROWS, rows - start), rows, rng)
+              for start in range(0, rows, GENERATE_CHUNK_ROWS))
+    if fmt in ('csv', 'txt'):
+        sep = ',' if fmt == 'csv' else '\t'
+        for index, chunk in enumerate(chunks):
+            chunk.to_csv(partial, sep=sep, index=False, header=index == 0, mode='w' if index == 0 else 'a')
+    elif fmt in PYARROW_FORMATS:
+        # One Parquet row group or Arrow record batch per chunk, as the streaming readers expect
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = (pq.ParquetWriter(partial, table.schema) if fmt == 'parquet'
+                              else pa.ipc.new_file(partial, table.schema))
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    elif fmt == 'npy':
+        array = np.lib.format.open_memmap(partial, mode='w+', dtype=NPY_DTYPE, shape=(rows,))
+        start = 0
+        for chunk in chunks:
+            for name in NPY_DTYPE.names:
+                array[name][start:start + len(chunk)] = chunk[name].to_numpy()
+            start += len(chunk)
+        array.flush()
+        del array
+    else:
+        frame = synthetic_chunk(0, rows, rows, rng)
+        if fmt == 'json':
+            frame.to_json(partial, orient='records', date_format='iso')
+        else:
+            frame.to_excel(partial, index=False, engine='openpyxl')
+    os.replace(partial, path)
+    return path
+
+def peak_memory(work):
+    """Run work() under tracemalloc and return its peak traced allocation in MB"""
+    tracemalloc.start()
+    try:
+        work()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+def measure(work, repeat=1, trace_memory=True):
+    """Return (best seconds over repeat runs, peak traced MB or None, result of the last run)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = work()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, peak_memory(work) if trace_memory else None, result
+
+class TimedAggregate:
+    """aggregate() callable for draw_chart that adds up the time spent computing aggregations"""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    def __call__(self, op, columns, compute, *params):
+        started = time.perf_counter()
+        try:
+            return compute_directly(op, columns, compute, *params)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+def render(data, chart_type):
+    """Draw a chart on a fresh Agg figure; return (figure, aggregate seconds, draw seconds)"""
+    col1, col2 = CHART_COLUMNS[chart_type]
+    chart_type, options = CHART_VARIANTS.get(chart_type, (chart_type, {}))
+    aggregate = TimedAggregate()
+    started = time.perf_counter()
+
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    draw_chart(ax, data, chart_type, col1, col2, {**CHART_OPTION_DEFAULTS, **options}, aggregate)
+    style_chart(ax, chart_type, col1)
+    fig.tight_layout()
+    fig.canvas.draw()
+
+    total = time.perf_counter() - started
+    return fig, aggregate.seconds, total - aggregate.seconds
+
+def export(fig, fmt):
+    """Pickle the figure and render the snapshot to a file, as DataVisualizer.export_chart does; return its size"""
+    handle, path = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(handle)
+    try:
+        export_figure(figure_snapshot(fig), path, dpi=300)
+        return os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+def benchmark_dataset(rows, fmt, charts, export_formats, repeat, trace_memory, compact, data_dir):
+    """Benchmark every stage for one dataset; return a list of result records"""
+    records = []
+
+    def record(stage, seconds, peak_mb, chart=None, **extra):
+        records.append({'format': fmt, 'rows': rows, 'chart': chart, 'stage': stage,
+                        'seconds': seconds, 'peak_mb': peak_mb, **extra})
+        label = f"{fmt:>7} {rows:>11,} {chart or '':<9} {stage:<10}"
+        memory = f"{peak_mb:10,.1f} MB" if peak_mb is not None else ""
+        print(f"{label} {seconds:9.3f}s {memory}" if seconds is not None else f"{label} {extra.get('error')}")
+
+    if rows > FORMAT_MAX_ROWS.get(fmt, rows):
+        record('parse', None, None, error=f"skipped: {fmt} is limited to {FORMAT_MAX_ROWS[fmt]:,} rows")
+        return records
+
+    try:
+        path = generate_dataset(rows, fmt, data_dir)
+        seconds, peak_mb, data = measure(lambda: read_data_file(path, compact=compact), repeat, trace_memory)
+    except Exception as e:
+        record('parse', None, None, error=f"{type(e).__name__}: {e}")
+        return records
+    record('parse', seconds, peak_mb, file_mb=os.path.getsize(path) / 1e6)
+
+    for chart_type in charts:
+        try:
+            timings = []
+            for _ in range(repeat):
+                fig, aggregate_seconds, draw_seconds = render(data, chart_type)
+                timings.append((aggregate_seconds, draw_seconds))
+            peak_mb = peak_memory(lambda: render(data, chart_type)) if trace_memory else None
+        except Exception as e:
+            record('draw', None, None, chart_type, error=f"{type(e).__name__}: {e}")
+            continue
+        record('aggregate', min(t[0] for t in timings), None, chart_type)
+        record('draw', min(t[1] for t in timings), peak_mb, chart_type)
+
+        for export_format in export_formats:
+            try:
+                seconds, peak_mb, size = measure(lambda: export(fig, export_format), repeat, trace_memory)
+            except Exception as e:
+                record(f"export_{export_format}", None, None, chart_type, error=f"{type(e).__name__}: {e}")
+                continue
+            record(f"export_{export_format}", seconds, peak_mb, chart_type, bytes=size)
+    return records
+
+def record_key(record):
+    return f"{record['format']}/{record['rows']}/{record['chart'] or '-'}/{record['stage']}"
+
+def compare(records, baseline, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+    """Return descriptions of the stages that regressed against the baseline"""
+    regressions = []
+    for record in records:
+        previous = baseline.get(record_key(record))
+        if previous is None or record['seconds'] is None or previous.get('seconds') is None:
+            continue
+        seconds, before = record['seconds'], previous['seconds']
+        if seconds > before * (1 + time_threshold) and seconds - before > MIN_SECONDS:
+            regressions.append(f"{record_key(record)}: {before:.3f}s -> {seconds:.3f}s "
+                               f"(+{100 * (seconds / before - 1):.0f}%)")
+        peak, peak_before = record['peak_mb'], previous.get('peak_mb')
+        if peak is not None and peak_before is not None:
+            if peak > peak_before * (1 + memory_threshold) and peak - peak_before > MIN_PEAK_MB:
+                regressions.append(f"{record_key(record)}: {peak_before:,.1f} MB -> {peak:,.1f} MB "
+                                   f"(+{100 * (peak / peak_before - 1):.0f}%)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Data Visualizer load and render paths")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="row counts to generate (10000 up to 100000000)")
+    parser.add_argument("--formats", nargs='+', choices=list(FORMATS),
+                        default=[fmt for fmt in FORMATS if HAS_PYARROW or fmt not in PYARROW_FORMATS],
+                        help="file formats to generate and parse (Parquet and Feather need pyarrow)")
+    parser.add_argument("--charts", nargs='+', choices=list(CHART_COLUMNS), default=list(CHART_COLUMNS),
+                        help="chart types to draw; Density is a density Heatmap")
+    parser.add_argument("--export-formats", nargs='+', default=EXPORT_FORMATS, help="savefig formats to time")
+    parser.add_argument("--repeat", type=int, default=1, help="timing runs per stage (the best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory pass")
+    parser.add_argument("--compact", action="store_true", help="load with compact dtypes")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="where generated datasets are kept")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD,
+                        help="allowed fractional slowdown before a stage counts as a regression")
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD,
+                        help="allowed fractional growth in peak memory")
+    parser.add_argument("--output", help="write all results to this JSON file")
+    args = parser.parse_args(argv)
+
+    records = []
+    for rows in args.sizes:
+        for fmt in args.formats:
+            records.extend(benchmark_dataset(rows, fmt, args.charts, args.export_formats, args.repeat,
+                                             not args.no_memory, args.compact, args.data_dir))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(records, handle, indent=2)
+
+    failed = [record for record in records if record.get('error') and not record['error'].startswith('skipped')]
+    for record in failed:
+        print(f"FAILED {record_key(record)}: {record['error']}")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as handle:
+                baseline = json.load(handle)
+        baseline.update((record_key(record), record) for record in records if record['seconds'] is not None)
+        with open(args.baseline, 'w', encoding='utf-8') as handle:
+            json.dump(baseline, handle, indent=2, sort_keys=True)
+        print(f"Baseline updated: {args.baseline}")
+        return 1 if failed else 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against; run with --update-baseline to record one.")
+        return 1 if failed else 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as handle:
+        regressions = compare(records, json.load(handle), args.time_threshold, args.memory_threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions or failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,2083 @@
+import time
+STARTED_AT = time.perf_counter()
+
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import numpy as np
-import seaborn as sns
+from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
 import traceback
-from matplotlib.widgets import Cursor
+import argparse
+import csv
+import glob
+import hashlib
+import importlib
+import importlib.util
+import io
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import re
+import sys
+import tempfile
+import threading
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+class _LazyModule:
+    """Stand-in for a heavy module that is imported on first attribute access.
+
+    setup(module) runs once, right after the import. Attributes are cached on the
+    proxy after the first lookup so later accesses cost a plain attribute read.
+    """
+
+    def __init__(self, name, setup=None):
+        self._name = name
+        self._setup = setup
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    module = importlib.import_module(self._name)
+                    if self._setup:
+                        self._setup(module)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        setattr(self, attr, value)
+        return value
+
+pd = _LazyModule('pandas')
+np = _LazyModule('numpy')
+plt = _LazyModule('matplotlib.pyplot', setup=lambda module: module.style.use('default'))
+sns = _LazyModule('seaborn')
+mdates = _LazyModule('matplotlib.dates')
+mcolors = _LazyModule('matplotlib.colors')
+
+WARM_UP_MODULES = (np, pd, plt, mdates, mcolors, sns)
+
+def warm_up_imports():
+    """Import the plotting stack ahead of its first use; seaborn goes last as it is the slowest"""
+    for module in WARM_UP_MODULES:
+        module._load()
+    importlib.import_module('matplotlib.backends.backend_tkagg')
+
+LOAD_CHUNK_ROWS = 200_000
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.feather', '.arrow', '.ipc')
+COLUMNAR_EXTENSIONS = PARQUET_EXTENSIONS + ARROW_EXTENSIONS + ('.npy',)
+DATA_EXTENSIONS = ('.csv', '.xlsx', '.xls', '.json', '.txt') + COLUMNAR_EXTENSIONS
+SOURCE_COLUMN = 'source_file'
+COMPACT_SAMPLE_ROWS = 50_000
+CATEGORY_MAX_RATIO = 0.5
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".data_visualizer", "cache")
+CACHE_MAX_BYTES = 4 * 1024 ** 3
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+DECIMATE_THRESHOLD = 50_000
+AGGREGATE_CACHE_BYTES = 512 * 1024 ** 2
+TAIL_MAX_BYTES = 64 * 1024 ** 2
+FOLLOW_FLUSH_RATIO = 0.1
+FOLLOW_CHECK_MS = 100
+CHART_TYPES = ["Bar", "Line", "Pie", "Scatter", "Histogram", "Boxplot", "Heatmap"]
+CHART_COLORS = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#34495e']
+BATCH_CACHED_DATASETS = 2
+CHART_OPTION_DEFAULTS = {
+    'bins': 10,
+    'correlation': True,
+    'density': False,
+    'value_column': '',
+    'stat': "count",
+    'log_scale': True,
+    'cluster': False,
+    'stream_path': '',
+    'bin_range': None,
+}
+DENSITY_STATS = ["count", "mean", "sum"]
+DENSITY_CHUNK_ROWS = 4_000_000
+ANNOTATE_MAX_COLUMNS = 20
+HAS_SCIPY = importlib.util.find_spec('scipy') is not None
+PREVIEW_ROWS = 15
+PREVIEW_COLUMNS = 8
+PREVIEW_CELL_CHARS = 40
+TRACE_ENV_VAR = "DATA_VIS_TRACE"
+SKETCH_K = 400
+HISTOGRAM_REFINE = 32
+BOX_MAX_OUTLIERS = 1000
+EXPORT_FORMATS = ['png', 'jpg', 'pdf', 'svg']
+VECTOR_FORMATS = ('pdf', 'svg', 'eps', 'ps')
+EXPORT_DPI = 300
+RASTERIZE_THRESHOLD = 5_000
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+SERVE_MAX_DATASETS = 4
+SERVE_MAX_UPLOAD_BYTES = 4 * 1024 ** 3
+SERVE_RESPONSE_CACHE_BYTES = 64 * 1024 ** 2
+SERVE_MAX_CATEGORIES = 500
+SERVE_PREVIEW_ROWS = 200
+SERVE_VIEW_SIZE = (1000, 600)
+SERVE_CELL_PIXELS = 4
+UPLOAD_DIR = os.path.join(os.path.expanduser("~"), ".data_visualizer", "uploads")
+STATIC_FILES = {'/': 'index.html', '/index.html': 'index.html', '/script.js': 'script.js', '/style.css': 'style.css'}
+
+class TaskCancelled(Exception):
+    """Raised inside a background task when the user cancels it"""
+
+def csv_options(file_path):
+    """Return the read_csv keyword arguments used for a delimited text file"""
+    if file_path.endswith('.txt'):
+        return {'sep': None, 'engine': 'python'}
+    return {}
+
+def is_text_dtype(series):
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+def compact_plan(sample):
+    """Decide from a sample which text columns should load as datetimes or categoricals"""
+    plan = {'dates': {}, 'categories': []}
+    for col in sample.columns:
+        if not is_text_dtype(sample[col]) or isinstance(sample[col].dtype, pd.CategoricalDtype):
+            continue
+        values = sample[col].dropna()
+        if values.empty:
+            continue
+        date_format = pd.tseries.api.guess_datetime_format(str(values.iloc[0]))
+        if date_format and pd.to_datetime(values, format=date_format, errors='coerce').notna().mean() >= 0.95:
+            plan['dates'][col] = date_format
+        elif values.nunique() <= CATEGORY_MAX_RATIO * len(values):
+            plan['categories'].append(col)
+    return plan
+
+def compact_frame(frame, plan=None):
+    """Downcast numeric columns and apply a compact_plan's datetime and categorical conversions.
+
+    Floats are only narrowed to float32 when every value survives the round trip.
+    """
+    if plan is None:
+        plan = compact_plan(frame)
+    for col in frame.columns:
+        series = frame[col]
+        if col in plan['dates']:
+            frame[col] = pd.to_datetime(series, format=plan['dates'][col], errors='coerce')
+        elif col in plan['categories']:
+            frame[col] = series.astype('category')
+        elif pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            frame[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            narrowed = series.astype('float32')
+            if np.array_equal(narrowed.to_numpy(dtype=float), series.to_numpy(dtype=float), equal_nan=True):
+                frame[col] = narrowed
+    return frame
+
+def concat_frames(frames):
+    """Concatenate frames, merging categorical columns instead of letting them fall back to object"""
+    frames = list(frames)
+    if len(frames) > 1:
+        for col in frames[0].columns:
+            if not isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+                continue
+            parts = [frame[col].astype('category') for frame in frames]
+            present = [part for part in parts if len(part.cat.categories)] or parts[:1]
+            try:
+                categories = pd.api.types.union_categoricals(present, ignore_order=True).categories
+            except TypeError:
+                continue
+            dtype = pd.CategoricalDtype(categories)
+            for frame, part in zip(frames, parts):
+                frame[col] = part.astype(dtype)
+    return pd.concat(frames, ignore_index=True)
+
+def is_columnar(file_path):
+    return file_path.lower().endswith(COLUMNAR_EXTENSIONS)
+
+def require_pyarrow(file_path):
+    if not HAS_PYARROW:
+        raise ValueError(f"Reading {os.path.splitext(file_path)[1]} files needs the pyarrow package.")
+
+def npy_frame(array, columns=None):
+    """Wrap a (memory-mapped) NPY array as a DataFrame: structured fields, 2-D columns or one 'value' column"""
+    if array.dtype.names:
+        names = columns or list(array.dtype.names)
+        return pd.DataFrame({name: np.asarray(array[name]) for name in names})
+    if array.ndim == 1:
+        return pd.DataFrame({'value': np.asarray(array)})
+    names = [f"column_{i}" for i in range(array.shape[1])]
+    indexes = [names.index(name) for name in columns] if columns else range(len(names))
+    return pd.DataFrame({names[i]: np.asarray(array[:, i]) for i in indexes})
+
+def npy_columns(array):
+    if array.dtype.names:
+        return list(array.dtype.names)
+    if array.ndim == 1:
+        return ['value']
+    return [f"column_{i}" for i in range(array.shape[1])]
+
+def read_columnar(file_path, columns=None):
+    """Read a Parquet, Feather/Arrow or NPY file through a memory map, keeping only columns.
+
+    Nothing outside the requested columns is decoded.
+    """
+    lower = file_path.lower()
+    if lower.endswith('.npy'):
+        return npy_frame(np.load(file_path, mmap_mode='r'), columns)
+
+    require_pyarrow(file_path)
+    if lower.endswith(PARQUET_EXTENSIONS):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(file_path, memory_map=True).read(columns=columns).to_pandas()
+
+    import pyarrow.feather as feather
+    return feather.read_table(file_path, columns=columns, memory_map=True).to_pandas()
+
+def iter_columnar_chunks(file_path, chunksize=LOAD_CHUNK_ROWS, columns=None):
+    """Yield (chunk, bytes_read) pairs from a columnar file: Parquet row groups, Arrow record batches
+    or NPY row slices. bytes_read is estimated from the fraction of the file covered.
+    """
+    total_bytes = os.path.getsize(file_path)
+    lower = file_path.lower()
+    if lower.endswith('.npy'):
+        array = np.load(file_path, mmap_mode='r')
+        for start in range(0, len(array), chunksize):
+            stop = min(start + chunksize, len(array))
+            yield npy_frame(array[start:stop], columns), int(total_bytes * stop / len(array))
+        return
+
+    require_pyarrow(file_path)
+    import pyarrow as pa
+    if lower.endswith(PARQUET_EXTENSIONS):
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(file_path, memory_map=True)
+        for index in range(parquet.num_row_groups):
+            chunk = parquet.read_row_group(index, columns=columns).to_pandas()
+            yield chunk, int(total_bytes * (index + 1) / parquet.num_row_groups)
+        return
+
+    with pa.memory_map(file_path) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            yield read_columnar(file_path, columns), total_bytes
+            return
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            if columns:
+                batch = batch.select(columns)
+            yield batch.to_pandas(), int(total_bytes * (index + 1) / reader.num_record_batches)
+
+def peek_columns(file_path):
+    """Return the column names of a file without loading it, or None if the format needs a full parse"""
+    if file_path.lower().endswith('.npy'):
+        return npy_columns(np.load(file_path, mmap_mode='r'))
+    if is_columnar(file_path):
+        require_pyarrow(file_path)
+        if file_path.lower().endswith(PARQUET_EXTENSIONS):
+            import pyarrow.parquet as pq
+            return list(pq.read_schema(file_path).names)
+        import pyarrow as pa
+        with pa.memory_map(file_path) as source:
+            try:
+                return list(pa.ipc.open_file(source).schema.names)
+            except pa.ArrowInvalid:
+                return list(read_columnar(file_path).columns)
+    if file_path.endswith(('.csv', '.txt')):
+        return list(pd.read_csv(file_path, nrows=0, **csv_options(file_path)).columns)
+    if file_path.endswith(('.xlsx', '.xls')):
+        return list(pd.read_excel(file_path, nrows=0).columns)
+    return None
+
+def iter_file_chunks(file_path, chunksize=LOAD_CHUNK_ROWS, **options):
+    """Yield (chunk, bytes_read) pairs from a CSV or TXT file; options go to read_csv"""
+    with open(file_path, 'rb') as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunksize, **options):
+            yield chunk, handle.tell()
+
+def is_streamable(file_path):
+    return file_path.endswith(('.csv', '.txt')) or is_columnar(file_path)
+
+def iter_data_chunks(file_path, chunksize=LOAD_CHUNK_ROWS, usecols=None):
+    """Yield (chunk, bytes_read) pairs from a CSV, TXT or columnar file, reading only usecols"""
+    if is_columnar(file_path):
+        yield from iter_columnar_chunks(file_path, chunksize, usecols)
+        return
+    options = csv_options(file_path)
+    if usecols:
+        options['usecols'] = usecols
+    yield from iter_file_chunks(file_path, chunksize, **options)
+
+def read_sample(file_path, rows=COMPACT_SAMPLE_ROWS):
+    """The first rows of a streamable file"""
+    if is_columnar(file_path):
+        for chunk, _ in iter_columnar_chunks(file_path, rows):
+            return chunk.head(rows)
+        return pd.DataFrame(columns=peek_columns(file_path))
+    return pd.read_csv(file_path, nrows=rows, **csv_options(file_path))
+
+def expand_sources(pattern):
+    """Return the data files in a directory, or matching a glob pattern, in sorted order"""
+    pattern = os.path.expanduser(pattern)
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path) and path.lower().endswith(DATA_EXTENSIONS))
+
+def file_fingerprint(file_path):
+    stat = os.stat(file_path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+def ingest_file(file_path, compact=False):
+    """Parse one file of a multi-file ingest; runs in a worker process"""
+    started = time.perf_counter()
+    fingerprint = file_fingerprint(file_path)
+    data = read_data_file(file_path, compact=compact)
+    return data, fingerprint, time.perf_counter() - started
+
+def source_labels(paths):
+    """Short, unique labels for source files: their paths relative to the common directory"""
+    base = os.path.commonpath(paths) if len(paths) > 1 else os.path.dirname(paths[0])
+    return {path: os.path.relpath(path, base) for path in paths}
+
+def combine_sources(frames, labels):
+    """Concatenate per-file frames over the union of their columns, tagging each row with its source.
+
+    Columns missing from a file are filled with NaN; the source_file column is categorical.
+    """
+    columns = list(dict.fromkeys(col for frame in frames.values() for col in frame.columns if col != SOURCE_COLUMN))
+    sources = pd.CategoricalDtype([labels[path] for path in frames])
+    parts = []
+    for code, (path, frame) in enumerate(frames.items()):
+        part = frame.reindex(columns=columns)
+        part[SOURCE_COLUMN] = pd.Categorical.from_codes(np.full(len(part), code), dtype=sources)
+        parts.append(part)
+    return concat_frames(parts)
+
+def read_data_file(file_path, progress=None, cancel_event=None, chunksize=LOAD_CHUNK_ROWS,
+                   usecols=None, compact=False, baseline=None):
+    """Parse a data file into a DataFrame.
+
+    CSV and TXT files are read in chunks so that progress(rows, bytes_read, total_bytes)
+    can be reported and cancel_event can abort the parse between chunks. usecols loads
+    only the listed columns and compact stores them in the smallest dtypes that hold
+    the data. When compacting, baseline (a dict) receives each column's estimated
+    memory under a plain load.
+    """
+    total_bytes = os.path.getsize(file_path)
+
+    def check_cancel():
+        if cancel_event is not None and cancel_event.is_set():
+            raise TaskCancelled()
+
+    check_cancel()
+    if file_path.endswith(('.csv', '.txt')):
+        options = csv_options(file_path)
+        if usecols:
+            options['usecols'] = usecols
+        plan = None
+        if compact:
+            sample = pd.read_csv(file_path, nrows=COMPACT_SAMPLE_ROWS, **options)
+            plan = compact_plan(sample)
+            sample_bytes = sample.memory_usage(deep=True, index=False) / max(len(sample), 1)
+
+        chunks = []
+        rows = 0
+        for chunk, bytes_read in iter_file_chunks(file_path, chunksize, **options):
+            check_cancel()
+            chunks.append(compact_frame(chunk, plan) if compact else chunk)
+            rows += len(chunk)
+            if progress:
+                progress(rows, bytes_read, total_bytes)
+
+        if not chunks:
+            return pd.read_csv(file_path, **options)
+        data = concat_frames(chunks)
+        if compact and baseline is not None:
+            baseline.update((col, int(size * len(data))) for col, size in sample_bytes.items())
+        return data
+
+    if is_columnar(file_path):
+        data = read_columnar(file_path, list(usecols) if usecols else None)
+    elif file_path.endswith(('.xlsx', '.xls')):
+        data = pd.read_excel(file_path, usecols=usecols)
+    elif file_path.endswith('.json'):
+        data = pd.read_json(file_path)
+        if usecols:
+            data = data[list(usecols)]
+    else:
+        raise ValueError("File format not supported.")
+
+    check_cancel()
+    if compact:
+        if baseline is not None:
+            baseline.update(data.memory_usage(deep=True, index=False).items())
+        data = compact_frame(data)
+    if progress:
+        progress(len(data), total_bytes, total_bytes)
+    return data
+
+class LoadCache:
+    """On-disk cache of parsed DataFrames keyed by file fingerprint and parse options.
+
+    Frames are stored as Feather files when pyarrow is available (pickle otherwise,
+    or when a frame has columns Arrow cannot represent). The least recently used
+    entries are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock = threading.Lock()
+
+    def key(self, file_path, options=None):
+        stat = os.stat(file_path)
+        fingerprint = [os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, options or {}]
+        return hashlib.sha1(json.dumps(fingerprint, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(index, handle, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def get(self, file_path, options=None):
+        """Return the cached frame for file_path, or None if there is no valid entry"""
+        key = self.key(file_path, options)
+        with self.lock:
+            index = self._read_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+
+            path = os.path.join(self.cache_dir, entry['file'])
+            try:
+                if entry['format'] == 'feather':
+                    data = pd.read_feather(path)
+                else:
+                    data = pd.read_pickle(path)
+            except Exception:
+                index.pop(key, None)
+                self._remove_file(entry['file'])
+                self._write_index(index)
+                return None
+
+            entry['last_used'] = time.time()
+            self._write_index(index)
+            return data
+
+    def put(self, file_path, options, data):
+        """Store data for file_path and evict old entries if the cache is over budget"""
+        key = self.key(file_path, options)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        fmt = 'pickle'
+        if HAS_PYARROW:
+            try:
+                data.to_feather(os.path.join(self.cache_dir, key + ".feather"))
+                fmt = 'feather'
+            except Exception:
+                self._remove_file(key + ".feather")
+        if fmt == 'pickle':
+            data.to_pickle(os.path.join(self.cache_dir, key + ".pkl"))
+
+        name = key + (".feather" if fmt == 'feather' else ".pkl")
+        with self.lock:
+            index = self._read_index()
+            index[key] = {
+                'file': name,
+                'format': fmt,
+                'source': os.path.abspath(file_path),
+                'options': options or {},
+                'rows': len(data),
+                'columns': len(data.columns),
+                'bytes': os.path.getsize(os.path.join(self.cache_dir, name)),
+                'last_used': time.time(),
+            }
+            self._evict(index)
+            self._write_index(index)
+
+    def _evict(self, index):
+        total = sum(entry['bytes'] for entry in index.values())
+        for key, entry in sorted(index.items(), key=lambda item: item[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= entry['bytes']
+            self._remove_file(entry['file'])
+            del index[key]
+
+    def _remove_file(self, name):
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+    def entries(self):
+        """Return the cache entries, most recently used first"""
+        with self.lock:
+            index = self._read_index()
+        return sorted(index.values(), key=lambda entry: entry['last_used'], reverse=True)
+
+    def total_bytes(self):
+        return sum(entry['bytes'] for entry in self.entries())
+
+    def clear(self):
+        with self.lock:
+            for entry in self._read_index().values():
+                self._remove_file(entry['file'])
+            self._write_index({})
+
+def estimate_nbytes(value):
+    """Rough in-memory size of an aggregation result"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, (LinePyramid, ScatterPyramid)):
+        return estimate_nbytes(value.levels)
+    return sys.getsizeof(value)
+
+class AggregationCache:
+    """Memoizes aggregation results keyed by operation, columns, parameters and dataset version.
+
+    Least recently used results are evicted once their estimated size passes max_bytes.
+    """
+
+    def __init__(self, max_bytes=AGGREGATE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, compute):
+        """Return the cached result for key, calling compute() on a miss"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+
+        result = compute()
+        self.put(key, result)
+        return result
+
+    def put(self, key, result):
+        """Store a result computed elsewhere, e.g. by a running aggregate"""
+        size = estimate_nbytes(result)
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (result, size)
+                self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def summary(self):
+        return (f"{self.hits} hits / {self.misses} misses, "
+                f"{len(self.entries)} entries, {self.total_bytes / 1e6:,.1f} MB")
+
+class CorrelationAccumulator:
+    """Streaming Pearson correlation built from pairwise-complete sums.
+
+    Values are shifted by the first chunk's column means before being summed, which
+    keeps the float64 sums of squares and cross-products well conditioned. Rows where
+    either value of a pair is missing are left out of that pair, as in DataFrame.corr.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.shift = None
+        self.n = np.zeros((size, size))
+        self.sums = np.zeros((size, size))
+        self.squares = np.zeros((size, size))
+        self.products = np.zeros((size, size))
+
+    def update(self, frame):
+        values = frame[self.columns].to_numpy(dtype=float, na_value=np.nan)
+        if len(values) == 0:
+            return
+        present = ~np.isnan(values)
+        if self.shift is None:
+            counts = present.sum(axis=0)
+            self.shift = np.where(counts > 0, np.nansum(values, axis=0) / np.maximum(counts, 1), 0.0)
+        values = values - self.shift
+        weights = present.astype(float)
+        values = np.where(present, values, 0.0)
+
+        self.n += weights.T @ weights
+        self.sums += values.T @ weights
+        self.squares += (values * values).T @ weights
+        self.products += values.T @ values
+
+    def matrix(self):
+        """Return the correlation matrix as a DataFrame"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n = self.n
+            covariance = self.products - self.sums * self.sums.T / n
+            variance = self.squares - self.sums ** 2 / n
+            corr = covariance / np.sqrt(variance * variance.T)
+        corr[(n < 2) | ~np.isfinite(corr)] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        diagonal = np.diag(n) >= 2
+        corr[np.diag_indices_from(corr)] = np.where(diagonal & (np.diag(variance) > 0), 1.0, np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+def frame_correlation(data, chunksize=LOAD_CHUNK_ROWS):
+    """Pearson correlation of the numeric columns of data, accumulated chunk by chunk in float64"""
+    accumulator = CorrelationAccumulator(data.select_dtypes(include=[np.number]).columns)
+    for start in range(0, len(data), chunksize):
+        accumulator.update(data.iloc[start:start + chunksize])
+    return accumulator.matrix()
+
+def stream_correlation(file_path, progress=None, cancel_event=None, chunksize=LOAD_CHUNK_ROWS):
+    """Correlation of a file's numeric columns computed without holding the file in memory.
+
+    CSV, TXT and columnar files are streamed in chunks; the numeric columns are picked
+    from a sample and later chunks are coerced to numbers. Excel and JSON files have to
+    be read whole.
+    progress(rows, bytes_read, total_bytes) is called after every chunk.
+    """
+    total_bytes = os.path.getsize(file_path)
+    if not is_streamable(file_path):
+        return frame_correlation(read_data_file(file_path, cancel_event=cancel_event), chunksize)
+
+    columns = list(read_sample(file_path).select_dtypes(include=[np.number]).columns)
+    accumulator = CorrelationAccumulator(columns)
+    if not columns:
+        return accumulator.matrix()
+
+    rows = 0
+    for chunk, bytes_read in iter_data_chunks(file_path, chunksize, usecols=columns):
+        if cancel_event is not None and cancel_event.is_set():
+            raise TaskCancelled()
+        accumulator.update(chunk.apply(pd.to_numeric, errors='coerce'))
+        rows += len(chunk)
+        if progress:
+            progress(rows, bytes_read, total_bytes)
+    return accumulator.matrix()
+
+def cluster_order(corr):
+    """Order correlation matrix columns so that strongly correlated columns sit together.
+
+    Uses average-linkage hierarchical clustering on 1 - |r| when scipy is installed and
+    a greedy nearest-neighbour chain otherwise.
+    """
+    size = len(corr)
+    if size < 3:
+        return list(range(size))
+    similarity = np.nan_to_num(np.abs(corr.to_numpy()), nan=0.0)
+    np.fill_diagonal(similarity, 1.0)
+    distance = 1.0 - similarity
+
+    if HAS_SCIPY:
+        from scipy.cluster.hierarchy import leaves_list, linkage
+        from scipy.spatial.distance import squareform
+        return [int(i) for i in leaves_list(linkage(squareform(distance, checks=False), method='average'))]
+
+    order = [int(np.argmin(similarity.sum(axis=0)))]
+    remaining = np.ones(size, dtype=bool)
+    remaining[order[0]] = False
+    while remaining.any():
+        candidates = np.where(remaining, distance[order[-1]], np.inf)
+        order.append(int(np.argmin(candidates)))
+        remaining[order[-1]] = False
+    return order
+
+def iter_column_values(file_path, col, progress=None, cancel_event=None, chunksize=LOAD_CHUNK_ROWS):
+    """Yield the numeric values of one column of a file as float arrays, chunk by chunk.
+
+    CSV, TXT and columnar files are read with usecols so only that column is parsed;
+    Excel and JSON are loaded whole. Values that are missing, infinite or not numbers
+    are dropped.
+    """
+    if not is_streamable(file_path):
+        data = read_data_file(file_path, cancel_event=cancel_event, usecols=[col])
+        values = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        yield values[np.isfinite(values)]
+        return
+
+    total_bytes = os.path.getsize(file_path)
+    rows = 0
+    for chunk, bytes_read in iter_data_chunks(file_path, chunksize, usecols=[col]):
+        if cancel_event is not None and cancel_event.is_set():
+            raise TaskCancelled()
+        values = pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        rows += len(chunk)
+        if progress:
+            progress(rows, bytes_read, total_bytes)
+        yield values[np.isfinite(values)]
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang and Liberty) in bounded memory.
+
+    Level h holds sorted samples that each stand for 2**h values. A level that outgrows
+    its capacity is compacted by keeping every other item, from a random offset, and
+    promoting them a level. Rank error is roughly 1.7/k with high probability.
+    """
+
+    def __init__(self, k=SKETCH_K, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                kept = len(items) % 2
+                promoted = items[kept:][self.rng.integers(2)::2]
+                self.levels[level] = items[:kept]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def weighted_items(self):
+        """Return the retained items in sorted order with their cumulative weights"""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs):
+        qs = np.asarray(qs, dtype=float)
+        items, cumulative = self.weighted_items()
+        result = items[np.searchsorted(cumulative, qs * cumulative[-1], side='left').clip(0, len(items) - 1)]
+        result = np.where(qs <= 0, self.min, result)
+        return np.where(qs >= 1, self.max, result)
+
+class StreamingHistogram:
+    """Histogram built chunk by chunk without knowing the data range in advance.
+
+    With value_range the bin edges are fixed and counts are exact. Otherwise counts go
+    into HISTOGRAM_REFINE times as many internal bins as requested; when values fall
+    outside the covered range, neighbouring bins are merged in pairs to double the
+    width. The result is re-binned onto even edges between the exact minimum and
+    maximum, interpolating within internal bins.
+    """
+
+    def __init__(self, bins, value_range=None):
+        self.bins = bins
+        self.value_range = value_range
+        self.size = bins * HISTOGRAM_REFINE
+        self.counts = np.zeros(bins if value_range else self.size)
+        self.origin = None
+        self.width = None
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        if self.value_range:
+            self.counts += np.histogram(values, bins=self.bins, range=self.value_range)[0]
+            return
+
+        if self.origin is None:
+            self.origin = values.min()
+            spread = values.max() - self.origin
+            self.width = spread / self.size if spread > 0 else max(abs(self.origin), 1.0) * 1e-6
+        self.cover(values.min(), values.max())
+        index = ((values - self.origin) / self.width).astype(np.int64).clip(0, self.size - 1)
+        self.counts += np.bincount(index, minlength=self.size)
+
+    def cover(self, low, high):
+        """Double the bin width until [low, high] falls inside the internal bins"""
+        if not (np.isfinite(low) and np.isfinite(high)):
+            raise ValueError("Histogram bounds must be finite.")
+        half = self.size // 2
+        while low < self.origin or high >= self.origin + self.size * self.width:
+            merged = self.counts.reshape(half, 2).sum(axis=1)
+            self.width *= 2
+            if low < self.origin:
+                self.origin -= half * self.width
+                self.counts = np.concatenate([np.zeros(half), merged])
+            else:
+                self.counts = np.concatenate([merged, np.zeros(half)])
+
+    def result(self):
+        """Return (counts, edges) like np.histogram"""
+        if self.value_range:
+            return self.counts, np.linspace(*self.value_range, self.bins + 1)
+        if self.origin is None:
+            return np.zeros(self.bins), np.linspace(0.0, 1.0, self.bins + 1)
+        low, high = (self.min, self.max) if self.max > self.min else (self.min - 0.5, self.max + 0.5)
+        edges = np.linspace(low, high, self.bins + 1)
+        internal_edges = self.origin + self.width * np.arange(self.size + 1)
+        cumulative = np.concatenate([[0.0], np.cumsum(self.counts)])
+        below = np.interp(edges, internal_edges, cumulative)
+        below[0], below[-1] = 0.0, cumulative[-1]
+        return np.diff(below), edges
+
+def stream_histogram(file_path, col, bins, value_range=None, progress=None, cancel_event=None):
+    """Histogram counts and edges of one column of a file, read in chunks"""
+    histogram = StreamingHistogram(bins, value_range)
+    for values in iter_column_values(file_path, col, progress, cancel_event):
+        histogram.update(values)
+    if not np.isfinite(histogram.min):
+        raise ChartError("Data Error", f"Column '{col}' has no numeric values.")
+    return histogram.result()
+
+class OutlierSample:
+    """Uniform random sample of at most size values from a stream, plus its two extremes.
+
+    Every value gets a random key and the size smallest keys are kept (bottom-k
+    sampling), so the sample covers the whole range of outliers rather than its tail.
+    """
+
+    def __init__(self, size=BOX_MAX_OUTLIERS, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.values = np.empty(0)
+        self.keys = np.empty(0)
+        self.min, self.max = np.inf, -np.inf
+
+    def update(self, values):
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.values = np.concatenate([self.values, values])
+        self.keys = np.concatenate([self.keys, self.rng.random(len(values))])
+        if len(self.values) > self.size:
+            keep = np.argpartition(self.keys, self.size - 1)[:self.size]
+            self.values, self.keys = self.values[keep], self.keys[keep]
+
+    def result(self):
+        if len(self.values) == 0:
+            return self.values
+        return np.unique(np.concatenate([self.values, [self.min, self.max]]))
+
+def box_stats(col, q1, median, q3, whislo, whishi, low, high):
+    """Axes.bxp statistics; whiskers fall back to the quartiles when no value lies inside the fences"""
+    return {'label': col, 'med': median, 'q1': q1, 'q3': q3,
+            'whislo': whislo if np.isfinite(whislo) else q1, 'whishi': whishi if np.isfinite(whishi) else q3,
+            'fliers': np.concatenate([low.result(), high.result()])}
+
+def stream_box_stats(file_path, col, progress=None, cancel_event=None):
+    """Boxplot statistics of one column of a file for Axes.bxp, in bounded memory.
+
+    The first pass estimates the quartiles with a KLLSketch. Once the fences are known,
+    a second pass finds the exact whisker ends and samples up to BOX_MAX_OUTLIERS
+    outliers on each side with an OutlierSample. Excel and JSON files are loaded once
+    and go through frame_box_stats instead.
+    """
+    if not is_streamable(file_path):
+        values = next(iter_column_values(file_path, col, progress, cancel_event))
+        return frame_box_stats(pd.Series(values), col)
+
+    def pass_progress(first):
+        # Each pass reports half of the progress bar
+        if progress is None:
+            return None
+        return lambda rows, bytes_read, total_bytes: progress(
+            rows, (bytes_read if first else total_bytes + bytes_read) // 2, total_bytes)
+
+    sketch = KLLSketch()
+    for values in iter_column_values(file_path, col, pass_progress(True), cancel_event):
+        sketch.update(values)
+    if sketch.n == 0:
+        raise ChartError("Data Error", f"Column '{col}' has no numeric values.")
+
+    q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+    low_fence, high_fence = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    whislo, whishi = np.inf, -np.inf
+    low, high = OutlierSample(), OutlierSample(seed=1)
+    for values in iter_column_values(file_path, col, pass_progress(False), cancel_event):
+        inside = values[(values >= low_fence) & (values <= high_fence)]
+        if len(inside):
+            whislo, whishi = min(whislo, inside.min()), max(whishi, inside.max())
+        low.update(values[values < low_fence])
+        high.update(values[values > high_fence])
+    return box_stats(col, q1, median, q3, whislo, whishi, low, high)
+
+def frame_box_stats(series, col):
+    """Boxplot statistics of a loaded column in the shape stream_box_stats returns, with exact quartiles"""
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        raise ChartError("Data Error", f"Column '{col}' has no numeric values.")
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    low_fence, high_fence = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = values[(values >= low_fence) & (values <= high_fence)]
+    low, high = OutlierSample(), OutlierSample(seed=1)
+    low.update(values[values < low_fence])
+    high.update(values[values > high_fence])
+    return box_stats(col, q1, median, q3, inside.min(initial=np.inf), inside.max(initial=-np.inf), low, high)
+
+class RunningAggregates:
+    """Chart aggregations kept up to date from appended rows instead of being recomputed"""
+
+    SUPPORTED = ('value_counts', 'groupby_mean', 'histogram', 'corr')
+
+    def __init__(self):
+        self.state = {}
+
+    def track(self, op, columns, params, data):
+        """Start maintaining an aggregation, computing its initial state from data"""
+        key = (op, tuple(columns), params)
+        if op not in self.SUPPORTED or key in self.state:
+            return
+        if op == 'value_counts':
+            self.state[key] = data[columns[0]].value_counts()
+        elif op == 'groupby_mean':
+            grouped = data.groupby(columns[0])[columns[1]]
+            self.state[key] = (grouped.sum(), grouped.count())
+        elif op == 'histogram':
+            values = pd.to_numeric(data[columns[0]], errors='coerce').dropna()
+            self.state[key] = np.histogram(values, bins=params[0])
+        elif op == 'corr':
+            accumulator = CorrelationAccumulator(data.select_dtypes(include=[np.number]).columns)
+            accumulator.update(data)
+            self.state[key] = accumulator
+
+    def update(self, rows):
+        """Fold newly appended rows into every tracked aggregation"""
+        for key, state in list(self.state.items()):
+            op, columns, params = key
+            if op == 'value_counts':
+                counts = state.add(rows[columns[0]].value_counts(), fill_value=0).astype('int64')
+                self.state[key] = counts.sort_values(ascending=False, kind='stable')
+            elif op == 'groupby_mean':
+                grouped = rows.groupby(columns[0])[columns[1]]
+                sums, counts = state
+                self.state[key] = (sums.add(grouped.sum(), fill_value=0),
+                                   counts.add(grouped.count(), fill_value=0).astype('int64'))
+            elif op == 'histogram':
+                counts, edges = state
+                values = pd.to_numeric(rows[columns[0]], errors='coerce').dropna().to_numpy()
+                if len(values) and (values.min() < edges[0] or values.max() > edges[-1]):
+                    del self.state[key]
+                    continue
+                self.state[key] = (counts + np.histogram(values, bins=edges)[0], edges)
+            elif op == 'corr':
+                state.update(rows)
+
+    def results(self):
+        """Yield (op, columns, params, result) for every tracked aggregation"""
+        for (op, columns, params), state in self.state.items():
+            if op == 'groupby_mean':
+                sums, counts = state
+                result = sums / counts.where(counts > 0)
+                result.name = columns[1]
+            elif op == 'corr':
+                result = state.matrix()
+            else:
+                result = state
+            yield op, columns, params, result
+
+class FileTruncated(Exception):
+    """Raised when a followed file shrinks, e.g. after log rotation"""
+
+class TailReader:
+    """Parses rows appended to a delimited text file since the last read"""
+
+    def __init__(self, file_path, offset, columns):
+        self.file_path = file_path
+        self.offset = offset
+        self.columns = list(columns)
+        self.file_columns = peek_columns(file_path)
+        self.options = csv_options(file_path)
+        if self.options.get('sep', ',') is None:
+            with open(file_path, 'r', newline='') as handle:
+                header = handle.readline()
+            try:
+                self.options = {'sep': csv.Sniffer().sniff(header).delimiter}
+            except csv.Error:
+                pass
+
+    def read_new(self, max_bytes=TAIL_MAX_BYTES):
+        """Return (rows, offset): complete rows appended after self.offset and the offset they end at.
+
+        rows is None when nothing new was appended. self.offset is left alone so that a read
+        on a worker thread only counts once the caller accepts its rows.
+        """
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            raise FileTruncated(f"{self.file_path} shrank from {self.offset} to {size} bytes")
+        if size == self.offset:
+            return None, self.offset
+
+        with open(self.file_path, 'rb') as handle:
+            handle.seek(self.offset)
+            block = handle.read(min(size - self.offset, max_bytes))
+        end = block.rfind(b'\n')
+        if end < 0:
+            return None, self.offset
+
+        block = block[:end + 1]
+        offset = self.offset + len(block)
+        if not block.strip():
+            return None, offset
+        rows = pd.read_csv(io.BytesIO(block), header=None, names=self.file_columns, **self.options)
+        return rows[self.columns], offset
+
+def align_dtypes(rows, like):
+    """Cast appended rows to the dtypes of an existing frame where the values allow it"""
+    for col in rows.columns:
+        if col in like.columns and isinstance(like[col].dtype, pd.CategoricalDtype):
+            continue
+        if col in like.columns and rows[col].dtype != like[col].dtype:
+            try:
+                rows[col] = rows[col].astype(like[col].dtype)
+            except (TypeError, ValueError):
+                pass
+    return rows
+
+def format_duration(seconds):
+    return f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+class StageTimer:
+    """Wall time and peak allocation for each stage of one load, plot or save.
+
+    Peak allocation is only measured while tracemalloc is tracing, which the trace log
+    turns on. Time passed to add() while a stage is open (aggregations computed during
+    drawing, for instance) is reported on its own and not counted in that stage too.
+    """
+
+    def __init__(self, operation, **details):
+        self.operation = operation
+        self.details = details
+        self.started = time.perf_counter()
+        self.stages = []
+        self.added_seconds = 0.0
+
+    @contextmanager
+    def stage(self, name):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        added_before = self.added_seconds
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started - (self.added_seconds - added_before)
+            peak = tracemalloc.get_traced_memory()[1] - baseline if tracing else None
+            self.stages.append({'name': name, 'seconds': seconds, 'peak_bytes': peak})
+
+    def add(self, name, seconds):
+        """Add time to a stage measured elsewhere, merging it with earlier time under the same name"""
+        self.added_seconds += seconds
+        for stage in self.stages:
+            if stage['name'] == name:
+                stage['seconds'] += seconds
+                return
+        self.stages.append({'name': name, 'seconds': seconds, 'peak_bytes': None})
+
+    def summary(self):
+        """Compact breakdown for the status bar, e.g. 'draw 85ms +3.2MB, canvas.draw 40ms'"""
+        parts = []
+        for stage in self.stages:
+            part = f"{stage['name']} {format_duration(stage['seconds'])}"
+            if stage['peak_bytes'] and stage['peak_bytes'] >= 100_000:
+                part += f" +{stage['peak_bytes'] / 1e6:.1f}MB"
+            parts.append(part)
+        return ", ".join(parts)
+
+    def record(self):
+        return {'time': datetime.now().isoformat(timespec='milliseconds'), 'operation': self.operation,
+                **self.details, 'total_seconds': time.perf_counter() - self.started, 'stages': self.stages}
+
+class TraceLog:
+    """Appends one JSON line per instrumented operation when a trace path is set.
+
+    Enabling the log also starts tracemalloc so that stages report peak allocation.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        if path and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def write(self, timer):
+        if not self.path:
+            return
+        line = json.dumps(timer.record(), default=str)
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as handle:
+                handle.write(line + "\n")
+
+class BackgroundTask:
+    """Runs a function on a worker thread and hands its messages back to the Tk loop"""
+
+    def __init__(self, description, work, on_done):
+        self.description = description
+        self.on_done = on_done
+        self.cancel_event = threading.Event()
+        self.messages = queue.Queue()
+        self.thread = threading.Thread(target=self._run, args=(work,), daemon=True)
+        self.thread.start()
+
+    def _run(self, work):
+        try:
+            result = work(self.report, self.cancel_event)
+            self.messages.put(('done', result))
+        except TaskCancelled:
+            self.messages.put(('cancelled', None))
+        except Exception as e:
+            self.messages.put(('error', (e, traceback.format_exc())))
+
+    def report(self, message):
+        self.messages.put(('progress', message))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+def is_plottable(series):
+    """Return True if a series can be drawn on a continuous numeric or date axis"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return True
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+def plot_values(series):
+    """Return a float array for a numeric or datetime series, or None if it cannot be decimated"""
+    if not is_plottable(series):
+        return None
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return mdates.date2num(series.to_numpy())
+    return series.to_numpy(dtype=float, na_value=np.nan)
+
+def minmax_decimate(x, y, xmin, xmax, n_buckets):
+    """Keep the lowest and highest point of each of n_buckets equal-width x buckets.
+
+    x must be sorted. Drawing the result with a line reproduces the pixel-column
+    envelope of the full series.
+    """
+    if len(x) <= 2 * n_buckets or xmax <= xmin:
+        return x, y
+    bucket = ((x - xmin) * (n_buckets / (xmax - xmin))).astype(np.int64)
+    np.clip(bucket, -1, n_buckets, out=bucket)
+    order = np.lexsort((y, bucket))
+    sorted_bucket = bucket[order]
+    boundary = sorted_bucket[1:] != sorted_bucket[:-1]
+    first = np.concatenate(([True], boundary))
+    last = np.concatenate((boundary, [True]))
+    keep = np.unique(np.concatenate((order[first], order[last])))
+    return x[keep], y[keep]
+
+class LinePyramid:
+    """Multi-resolution min/max summary of a line series.
+
+    Each level keeps the lowest and highest point of every block of `block` points
+    of the level below, so a zoomed view can be decimated from the coarsest level
+    that still has a few points per pixel column instead of from the raw data.
+    """
+
+    def __init__(self, x, y, block=16, min_points=8192):
+        self.block = block
+        self.min_points = min_points
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) > 1 and np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind='stable')
+            x, y = x[order], y[order]
+
+        self.storage = [(x, y)]
+        self.levels = [(x, y)]
+        while len(x) > max(min_points, block):
+            x, y = self._reduce(x, y)
+            self.storage.append((x, y))
+            self.levels.append((x, y))
+
+    def _reduce(self, x, y):
+        """Keep the lowest and highest point of every block of points (the last block may be partial)"""
+        block = self.block
+        n_blocks = -(-len(x) // block)
+        pad = n_blocks * block - len(x)
+        blocks = np.concatenate((y, np.repeat(y[-1:], pad))).reshape(n_blocks, block)
+        starts = np.arange(n_blocks) * block
+        lo = np.minimum(blocks.argmin(axis=1), blocks.argmax(axis=1)) + starts
+        hi = np.maximum(blocks.argmin(axis=1), blocks.argmax(axis=1)) + starts
+        keep = np.minimum(np.column_stack((lo, hi)).ravel(), len(x) - 1)
+        return x[keep], y[keep]
+
+    def _store(self, level, start, x, y):
+        """Overwrite a level from position start, growing its buffers by a quarter when full"""
+        if level == len(self.levels):
+            self.storage.append((np.empty(0), np.empty(0)))
+            self.levels.append(None)
+        x_buffer, y_buffer = self.storage[level]
+        end = start + len(x)
+        if end > len(x_buffer):
+            capacity = max(end, len(x_buffer) + len(x_buffer) // 4)
+            grown = np.empty(capacity), np.empty(capacity)
+            grown[0][:start], grown[1][:start] = x_buffer[:start], y_buffer[:start]
+            x_buffer, y_buffer = self.storage[level] = grown
+        x_buffer[start:end], y_buffer[start:end] = x, y
+        self.levels[level] = (x_buffer[:end], y_buffer[:end])
+
+    def extend(self, x, y):
+        """Append points that continue the series to the right; return False if they go back in x.
+
+        Only the new points and the last block of each level above them are reduced again,
+        so extending costs time in proportion to the appended points.
+        """
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) == 0:
+            return True
+        last_x = self.levels[0][0]
+        if (len(last_x) and x[0] < last_x[-1]) or np.any(np.diff(x) < 0):
+            return False
+
+        start = len(last_x)
+        self._store(0, start, x, y)
+        level = 1
+        while len(self.levels[level - 1][0]) > max(self.min_points, self.block):
+            below_x, below_y = self.levels[level - 1]
+            first_block = start // self.block if level < len(self.levels) else 0
+            reduced_x, reduced_y = self._reduce(below_x[first_block * self.block:],
+                                                below_y[first_block * self.block:])
+            start = 2 * first_block
+            self._store(level, start, reduced_x, reduced_y)
+            level += 1
+        return True
+
+    def extent(self):
+        """Return the (xmin, xmax) and (ymin, ymax) of the whole series"""
+        x, _ = self.levels[0]
+        _, y = self.levels[-1]
+        if len(x) == 0:
+            return (0.0, 1.0), (0.0, 1.0)
+        return (x[0], x[-1]), (y.min(), y.max())
+
+    def view(self, xmin, xmax, n_pixels):
+        """Return about 2 * n_pixels points covering [xmin, xmax]"""
+        x, y = self.levels[0]
+        if len(x) == 0:
+            return x, y
+        for level_x, level_y in reversed(self.levels):
+            visible = np.searchsorted(level_x, xmax, 'right') - np.searchsorted(level_x, xmin, 'left')
+            if visible >= 4 * n_pixels:
+                x, y = level_x, level_y
+                break
+        start = max(np.searchsorted(x, xmin, 'left') - 1, 0)
+        stop = np.searchsorted(x, xmax, 'right') + 1
+        return minmax_decimate(x[start:stop], y[start:stop], xmin, xmax, n_pixels)
+
+class ScatterPyramid:
+    """Multi-resolution occupancy grids of a point cloud.
+
+    Each level keeps one point per occupied grid cell. A view is served from the
+    coarsest level whose cells are no larger than a screen pixel, then thinned to
+    one point per pixel, which draws the same image as plotting every point.
+    """
+
+    def __init__(self, x, y, resolutions=(8192, 2048, 512), tail_ratio=0.1):
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        self.x_range = (x.min(), x.max()) if len(x) else (0.0, 1.0)
+        self.y_range = (y.min(), y.max()) if len(y) else (0.0, 1.0)
+        self.tail_ratio = tail_ratio
+        self.tail_x = self.tail_y = np.empty(0)
+
+        order = np.argsort(x)
+        x, y = x[order], y[order]
+        self.levels = [(np.inf, x, y)]
+        for resolution in resolutions:
+            keep = self._first_per_cell(x, y, self.x_range, self.y_range, resolution, resolution)
+            if keep.all():
+                continue
+            x, y = x[keep], y[keep]
+            self.levels.append((resolution, x, y))
+
+    def extend(self, x, y):
+        """Add points to a sorted tail that view() merges in.
+
+        Returns False once the tail passes tail_ratio of the points in the pyramid, when
+        rebuilding it is cheaper than carrying the tail through every view.
+        """
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) == 0:
+            return True
+        self.x_range = (min(self.x_range[0], x.min()), max(self.x_range[1], x.max()))
+        self.y_range = (min(self.y_range[0], y.min()), max(self.y_range[1], y.max()))
+        tail_x, tail_y = np.concatenate((self.tail_x, x)), np.concatenate((self.tail_y, y))
+        order = np.argsort(tail_x, kind='stable')
+        self.tail_x, self.tail_y = tail_x[order], tail_y[order]
+        return len(self.tail_x) <= self.tail_ratio * len(self.levels[0][1])
+
+    def extent(self):
+        """Return the (xmin, xmax) and (ymin, ymax) of the whole point cloud"""
+        return self.x_range, self.y_range
+
+    @staticmethod
+    def _first_per_cell(x, y, x_range, y_range, width, height):
+        """Return a mask selecting the first point that falls in each grid cell"""
+        x_span = (x_range[1] - x_range[0]) or 1.0
+        y_span = (y_range[1] - y_range[0]) or 1.0
+        ix = np.clip(((x - x_range[0]) * (width / x_span)).astype(np.int64), 0, width - 1)
+        iy = np.clip(((y - y_range[0]) * (height / y_span)).astype(np.int64), 0, height - 1)
+        return ~pd.Series(ix * height + iy).duplicated().to_numpy()
+
+    def view(self, xlim, ylim, width, height):
+        """Return at most one point per pixel of a width x height view of xlim/ylim"""
+        (xmin, xmax), (ymin, ymax) = sorted(xlim), sorted(ylim)
+        x_pixel = (xmax - xmin) / width
+        y_pixel = (ymax - ymin) / height
+        data_x_span = (self.x_range[1] - self.x_range[0]) or 1.0
+        data_y_span = (self.y_range[1] - self.y_range[0]) or 1.0
+
+        _, x, y = self.levels[0]
+        for resolution, level_x, level_y in reversed(self.levels[1:]):
+            if data_x_span / resolution <= x_pixel and data_y_span / resolution <= y_pixel:
+                x, y = level_x, level_y
+                break
 
-plt.style.use('default')
-sns.set_theme(style="whitegrid")
+        margin_x, margin_y = 5 * x_pixel, 5 * y_pixel
+        start = np.searchsorted(x, xmin - margin_x, 'left')
+        stop = np.searchsorted(x, xmax + margin_x, 'right')
+        x, y = x[start:stop], y[start:stop]
+        if len(self.tail_x):
+            start = np.searchsorted(self.tail_x, xmin - margin_x, 'left')
+            stop = np.searchsorted(self.tail_x, xmax + margin_x, 'right')
+            x = np.concatenate((x, self.tail_x[start:stop]))
+            y = np.concatenate((y, self.tail_y[start:stop]))
+        inside = (y >= ymin - margin_y) & (y <= ymax + margin_y)
+        x, y = x[inside], y[inside]
+        keep = self._first_per_cell(x, y, (xmin, xmax), (ymin, ymax), int(width), int(height))
+        return x[keep], y[keep]
+
+class RefreshingDraw:
+    """Stand-in for a watched artist's draw method that brings a stale view up to date first.
+
+    A module-level class rather than a closure so that the figure can still be pickled.
+    """
+
+    # The class draw it calls handles rasterization, so set_rasterized() still applies
+    _supports_rasterization = True
+
+    def __init__(self, refresher):
+        self.refresher = refresher
+
+    def __call__(self, renderer):
+        refresher = self.refresher
+        if refresher.stale:
+            refresher.refresh()
+        type(refresher.watched).draw(refresher.watched, renderer)
+
+class ViewRefresher:
+    """Base for helpers that recompute an artist for the current axes limits.
+
+    A zoom or pan usually changes both limits and fires a callback for each, so the
+    callbacks only mark the view stale; refresh() runs once, just before the artist
+    is next drawn.
+    """
+
+    def watch(self, ax, artist):
+        self.ax = ax
+        self.watched = artist
+        self.stale = False
+        self.cids = [ax.callbacks.connect('xlim_changed', self.mark_stale),
+                     ax.callbacks.connect('ylim_changed', self.mark_stale)]
+        artist.draw = RefreshingDraw(self)
+
+    def mark_stale(self, ax=None):
+        self.stale = True
+
+    def refresh(self):
+        raise NotImplementedError
+
+    def disconnect(self):
+        for cid in self.cids:
+            self.ax.callbacks.disconnect(cid)
+        vars(self.watched).pop('draw', None)
+
+class ZoomDecimator(ViewRefresher):
+    """Keeps a line or scatter artist decimated to the current axes limits"""
+
+    def __init__(self, ax, artist, pyramid):
+        self.artist = artist
+        self.pyramid = pyramid
+        self.watch(ax, artist)
+
+    def set_pyramid(self, pyramid):
+        """Swap in new data and rescale the axes to its full extent"""
+        self.pyramid = pyramid
+        (x0, x1), (y0, y1) = pyramid.extent()
+        self.ax.ignore_existing_data_limits = True
+        self.ax.update_datalim([(x0, y0), (x1, y1)])
+        self.ax.set_autoscale_on(True)
+        self.ax.autoscale_view()
+        self.refresh()
+
+    def extend(self, x, y):
+        """Append points to the pyramid; return False if it cannot take them.
+
+        The axes follow the data only while the whole series is in view; a zoomed or
+        panned view keeps its limits and is just re-decimated.
+        """
+        (x0, x1), (y0, y1) = self.pyramid.extent()
+        (xmin, xmax), (ymin, ymax) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        whole = ((self.ax.get_autoscalex_on() and self.ax.get_autoscaley_on())
+                 or (xmin <= x0 and x1 <= xmax and ymin <= y0 and y1 <= ymax))
+        if not self.pyramid.extend(x, y):
+            return False
+        if whole:
+            self.set_pyramid(self.pyramid)
+        else:
+            self.refresh()
+        return True
+
+    def refresh(self):
+        width = max(int(self.ax.bbox.width), 1)
+        height = max(int(self.ax.bbox.height), 1)
+        if isinstance(self.pyramid, LinePyramid):
+            xmin, xmax = sorted(self.ax.get_xlim())
+            x, y = self.pyramid.view(xmin, xmax, width)
+            self.artist.set_data(x, y)
+        else:
+            x, y = self.pyramid.view(self.ax.get_xlim(), self.ax.get_ylim(), width, height)
+            self.artist.set_offsets(np.column_stack((x, y)))
+        self.stale = False
+
+def bin_2d(x, y, xlim, ylim, width, height, values=None, stat="count"):
+    """Bin points into a height x width grid over xlim/ylim.
+
+    stat is "count", or "sum"/"mean" of values per bin. Empty bins are NaN for
+    "mean". Points are binned in chunks so temporary memory stays bounded.
+    """
+    (xmin, xmax), (ymin, ymax) = sorted(xlim), sorted(ylim)
+    x_scale = width / ((xmax - xmin) or 1.0)
+    y_scale = height / ((ymax - ymin) or 1.0)
+    counts = np.zeros(width * height)
+    sums = np.zeros(width * height) if stat != "count" else None
+
+    for start in range(0, len(x), DENSITY_CHUNK_ROWS):
+        cx = x[start:start + DENSITY_CHUNK_ROWS]
+        cy = y[start:start + DENSITY_CHUNK_ROWS]
+        inside = (cx >= xmin) & (cx <= xmax) & (cy >= ymin) & (cy <= ymax)
+        if sums is not None:
+            cv = values[start:start + DENSITY_CHUNK_ROWS]
+            inside &= ~np.isnan(cv)
+            cv = cv[inside]
+        ix = np.minimum(((cx[inside] - xmin) * x_scale).astype(np.int64), width - 1)
+        iy = np.minimum(((cy[inside] - ymin) * y_scale).astype(np.int64), height - 1)
+        flat = iy * width + ix
+        counts += np.bincount(flat, minlength=width * height)
+        if sums is not None:
+            sums += np.bincount(flat, weights=cv, minlength=width * height)
+
+    if stat == "count":
+        grid = counts
+    elif stat == "sum":
+        grid = np.where(counts > 0, sums, np.nan)
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grid = np.where(counts > 0, sums / counts, np.nan)
+    return grid.reshape(height, width)
+
+def density_norm(grid, log_scale):
+    """Pick a color normalization for a binned grid"""
+    finite = grid[np.isfinite(grid)]
+    if finite.size == 0:
+        return mcolors.Normalize(vmin=0, vmax=1)
+    vmin, vmax = finite.min(), finite.max()
+    if not log_scale:
+        return mcolors.Normalize(vmin=vmin, vmax=vmax)
+    if vmin > 0:
+        return mcolors.LogNorm(vmin=vmin, vmax=max(vmax, vmin * 1.0001))
+    linthresh = max(np.abs(finite).max() / 1e3, 1e-12)
+    return mcolors.SymLogNorm(linthresh=linthresh, vmin=vmin, vmax=vmax)
+
+class DensityRenderer(ViewRefresher):
+    """Draws a point cloud as one binned image and re-bins it after zoom or pan"""
+
+    def __init__(self, ax, x, y, values=None, stat="count", log_scale=True, pixels_per_bin=2, cmap='viridis'):
+        valid = ~(np.isnan(x) | np.isnan(y))
+        self.x, self.y = x[valid], y[valid]
+        self.values = values[valid] if values is not None else None
+        self.stat = stat if values is not None else "count"
+        self.log_scale = log_scale
+        self.pixels_per_bin = pixels_per_bin
+        self.ax = ax
+
+        x_range = (self.x.min(), self.x.max()) if len(self.x) else (0.0, 1.0)
+        y_range = (self.y.min(), self.y.max()) if len(self.y) else (0.0, 1.0)
+        grid = self._bin(x_range, y_range)
+        if self.stat == "count":
+            grid[grid == 0] = np.nan
+        self.image = ax.imshow(grid, origin='lower', aspect='auto', interpolation='nearest', cmap=cmap,
+                               extent=(*x_range, *y_range), norm=density_norm(grid, log_scale))
+        ax.set_xlim(*x_range)
+        ax.set_ylim(*y_range)
+        self.watch(ax, self.image)
+
+    def _bin(self, xlim, ylim):
+        width = max(int(self.ax.bbox.width) // self.pixels_per_bin, 1)
+        height = max(int(self.ax.bbox.height) // self.pixels_per_bin, 1)
+        return bin_2d(self.x, self.y, xlim, ylim, width, height, self.values, self.stat)
+
+    def refresh(self):
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        grid = self._bin(xlim, ylim)
+        if self.stat == "count":
+            grid[grid == 0] = np.nan
+        self.ax.set_autoscale_on(False)
+        self.image.set_data(grid)
+        self.image.set_extent((*sorted(xlim), *sorted(ylim)))
+        self.image.set_norm(density_norm(grid, self.log_scale))
+        self.stale = False
+
+def plot_density(ax, x_series, y_series, value_series=None, stat="count", log_scale=True):
+    """Draw a binned density image of two columns, or return None if they are not numeric"""
+    x = plot_values(x_series)
+    y = plot_values(y_series)
+    values = plot_values(value_series) if value_series is not None else None
+    if x is None or y is None or (value_series is not None and values is None):
+        return None
+
+    renderer = DensityRenderer(ax, x, y, values, stat, log_scale)
+    label = "count" if renderer.stat == "count" else f"{renderer.stat} of {value_series.name}"
+    ax.figure.colorbar(renderer.image, ax=ax, label=label)
+    if pd.api.types.is_datetime64_any_dtype(x_series):
+        ax.xaxis_date()
+    return renderer
+
+def plot_decimated(ax, kind, x_series, y_series, pyramid=None, **style):
+    """Draw a zoom-aware decimated Line or Scatter, or return None if the data cannot be decimated.
+
+    pyramid is the series' decimation_pyramid when the caller already has it.
+    """
+    if pyramid is None:
+        pyramid = decimation_pyramid(kind, x_series, y_series, ())
+    if pyramid is None:
+        return None
+
+    if kind == "Line":
+        if len(pyramid.levels[0][0]) == 0:
+            return None
+        (x0, x1), _ = pyramid.extent()
+        view_x, view_y = pyramid.view(x0, x1, max(int(ax.bbox.width), 1))
+        artist, = ax.plot(view_x, view_y, **style)
+    else:
+        if len(pyramid.levels[0][1]) == 0:
+            return None
+        (x0, x1), (y0, y1) = pyramid.extent()
+        view_x, view_y = pyramid.view((x0, x1), (y0, y1), max(int(ax.bbox.width), 1), max(int(ax.bbox.height), 1))
+        artist = ax.scatter(view_x, view_y, **style)
+        ax.update_datalim([(x0, y0), (x1, y1)])
+        ax.autoscale_view()
+
+    if pd.api.types.is_datetime64_any_dtype(x_series):
+        ax.xaxis_date()
+    return ZoomDecimator(ax, artist, pyramid)
+
+class BlitManager:
+    """Redraws a chart's data artists over a cached background for quick in-place updates"""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        self.cid = canvas.mpl_connect('draw_event', self.on_draw)
+
+    def set_artists(self, artists):
+        for artist in self.artists:
+            artist.set_animated(False)
+        self.artists = list(artists)
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.background = None
+
+    def on_draw(self, event):
+        if self.canvas.is_saving() or (event is not None and event.canvas is not self.canvas):
+            self.background = None
+            return
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in sorted(self.artists, key=lambda artist: artist.get_zorder()):
+            self.canvas.figure.draw_artist(artist)
+
+    def update(self):
+        """Blit the artists if a background is cached, otherwise fall back to a full draw"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+class PreviewGrid:
+    """Treeview window onto a DataFrame that only materializes the visible cells.
+
+    The scrollbars are virtual: they move a row and column offset into the frame, and
+    each move refills the grid from data.iloc for just that window, so browsing costs
+    the same on a hundred rows or a hundred million. Clicking a heading calls
+    on_column_selected(column). notes, a dict of short per-column descriptions, is
+    shown in a shaded row pinned above the data.
+    """
+
+    def __init__(self, master, on_column_selected=None):
+        self.data = None
+        self.notes = None
+        self.row_offset = 0
+        self.column_offset = 0
+        self.shown_columns = None
+        self.on_column_selected = on_column_selected
+
+        self.tree = ttk.Treeview(master, show='headings', height=PREVIEW_ROWS + 1, selectmode='none')
+        self.tree.tag_configure('notes', background='#eef2f7', foreground='#555555')
+        self.v_scroll = ttk.Scrollbar(master, orient=tk.VERTICAL, command=self.scroll_rows)
+        self.h_scroll = ttk.Scrollbar(master, orient=tk.HORIZONTAL, command=self.scroll_columns)
+
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        self.v_scroll.grid(row=0, column=1, sticky=tk.NS)
+        self.h_scroll.grid(row=1, column=0, sticky=tk.EW)
+        master.rowconfigure(0, weight=1)
+        master.columnconfigure(0, weight=1)
+
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll_rows('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.tree.bind('<Shift-MouseWheel>', lambda e: self.scroll_columns('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda e: self.scroll_rows('scroll', -1, 'units'))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_rows('scroll', 1, 'units'))
+
+    def set_data(self, data, keep_position=False, notes=None):
+        self.data = data
+        self.notes = notes
+        if not keep_position:
+            self.row_offset = self.column_offset = 0
+            self.shown_columns = None
+        self.refresh()
+
+    def scroll_rows(self, *args):
+        if self.data is not None:
+            self.row_offset = self.scrolled(args, self.row_offset, len(self.data), PREVIEW_ROWS)
+            self.refresh()
+
+    def scroll_columns(self, *args):
+        if self.data is not None:
+            self.column_offset = self.scrolled(args, self.column_offset, len(self.data.columns), PREVIEW_COLUMNS)
+            self.refresh()
+
+    @staticmethod
+    def scrolled(args, offset, total, page):
+        """Apply a Tk scroll command ('moveto', fraction) or ('scroll', n, 'units'|'pages') to an offset"""
+        if args[0] == 'moveto':
+            offset = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            offset += int(args[1]) * (page if args[2] == 'pages' else 1)
+        return max(0, min(offset, total - page))
+
+    @staticmethod
+    def fraction(offset, page, total):
+        if total <= 0:
+            return 0.0, 1.0
+        return offset / total, min(1.0, (offset + page) / total)
+
+    @staticmethod
+    def format_cell(value):
+        if isinstance(value, float):
+            return f"{value:.6g}"
+        text = str(value)
+        return text if len(text) <= PREVIEW_CELL_CHARS else text[:PREVIEW_CELL_CHARS - 3] + "..."
+
+    def refresh(self):
+        """Refill the grid with the rows and columns at the current offsets"""
+        data = self.data
+        self.row_offset = max(0, min(self.row_offset, len(data) - PREVIEW_ROWS))
+        columns = list(data.columns[self.column_offset:self.column_offset + PREVIEW_COLUMNS])
+
+        if columns != self.shown_columns:
+            ids = ['#index'] + [str(i) for i in range(len(columns))]
+            self.tree.configure(columns=ids)
+            self.tree.heading('#index', text='')
+            self.tree.column('#index', width=70, minwidth=50, stretch=False, anchor=tk.E)
+            for column_id, column in zip(ids[1:], columns):
+                command = (lambda c=column: self.on_column_selected(c)) if self.on_column_selected else ''
+                self.tree.heading(column_id, text=str(column), command=command)
+                self.tree.column(column_id, width=100, minwidth=60, stretch=True)
+            self.shown_columns = columns
+
+        window = data.iloc[self.row_offset:self.row_offset + PREVIEW_ROWS,
+                           self.column_offset:self.column_offset + PREVIEW_COLUMNS]
+        self.tree.delete(*self.tree.get_children())
+        if self.notes:
+            self.tree.insert('', tk.END, values=['', *[self.notes.get(column, '') for column in columns]],
+                             tags=('notes',))
+        for label, row in zip(window.index, window.itertuples(index=False, name=None)):
+            self.tree.insert('', tk.END, values=[label, *[self.format_cell(value) for value in row]])
+
+        self.v_scroll.set(*self.fraction(self.row_offset, PREVIEW_ROWS, len(data)))
+        self.h_scroll.set(*self.fraction(self.column_offset, PREVIEW_COLUMNS, len(data.columns)))
+
+def artist_size(artist):
+    """Number of points or paths an artist draws"""
+    from matplotlib.collections import Collection
+    from matplotlib.lines import Line2D
+    if isinstance(artist, Collection):
+        return max(len(artist.get_offsets()), len(artist.get_paths()))
+    if isinstance(artist, Line2D):
+        return len(artist.get_xdata())
+    return 0
+
+def rasterize_dense_artists(fig, threshold=RASTERIZE_THRESHOLD):
+    """Rasterize lines, collections and patch groups with more than threshold elements.
+
+    Used for vector exports, where each point would otherwise become its own element;
+    axes, labels and sparse artists stay vector. Returns how many artists were changed.
+    """
+    changed = 0
+    for ax in fig.axes:
+        for artist in [*ax.collections, *ax.lines]:
+            if artist_size(artist) > threshold:
+                artist.set_rasterized(True)
+                changed += 1
+        if len(ax.patches) > threshold:
+            for patch in ax.patches:
+                patch.set_rasterized(True)
+            changed += len(ax.patches)
+    return changed
+
+def figure_snapshot(fig):
+    """Pickle a figure for export_figure.
+
+    Views that are stale are brought up to date first. The RefreshingDraw hooks are
+    taken off the artists while pickling, so the snapshot does not carry the full
+    pyramids or point clouds behind them; they are put back afterwards.
+    """
+    hooked = [artist for artist in fig.findobj() if isinstance(vars(artist).get('draw'), RefreshingDraw)]
+    for artist in hooked:
+        if artist.draw.refresher.stale:
+            artist.draw.refresher.refresh()
+    hooks = [vars(artist).pop('draw') for artist in hooked]
+    try:
+        return pickle.dumps(fig)
+    finally:
+        for artist, hook in zip(hooked, hooks):
+            artist.draw = hook
+
+def export_figure(snapshot, file_path, dpi=EXPORT_DPI):
+    """Render a pickled figure snapshot to file_path; safe to call off the Tk thread"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = pickle.loads(snapshot)
+    FigureCanvasAgg(fig)
+    if os.path.splitext(file_path)[1].lstrip('.').lower() in VECTOR_FORMATS:
+        rasterize_dense_artists(fig)
+    fig.savefig(file_path, dpi=dpi, bbox_inches='tight', facecolor='white')
+
+def export_targets(base_path, formats, dpis):
+    """Return (file_path, dpi) pairs for a batch export; vector files are written once at the highest DPI"""
+    targets = []
+    for fmt in formats:
+        if fmt in VECTOR_FORMATS:
+            targets.append((f"{base_path}.{fmt}", max(dpis)))
+        else:
+            targets.extend((f"{base_path}_{dpi}dpi.{fmt}", dpi) for dpi in dpis)
+    return targets
+
+class ChartError(Exception):
+    """A column selection that the chosen chart type cannot draw"""
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+
+def compute_directly(op, columns, compute, *params):
+    """Aggregation hook that does no memoization"""
+    return compute()
+
+def value_counts(data, col, aggregate=compute_directly):
+    return aggregate('value_counts', [col], lambda: data[col].value_counts())
+
+def bar_values(data, col1, col2, aggregate=compute_directly):
+    """Return the per-category mean of col2, or the category counts of col1 without a Y column"""
+    if not col2:
+        return value_counts(data, col1, aggregate)
+    return aggregate('groupby_mean', [col1, col2], lambda: data.groupby(col1)[col2].mean())
+
+def correlation_matrix(data, aggregate=compute_directly, stream_path=''):
+    """Correlation matrix of the loaded numeric columns, or of a whole file when stream_path is set"""
+    if stream_path:
+        return aggregate('file_corr', [], lambda: stream_correlation(stream_path), stream_path)
+    return aggregate('corr', [], lambda: frame_correlation(data))
+
+def histogram_counts(data, col, bins, aggregate=compute_directly):
+    def compute():
+        return np.histogram(pd.to_numeric(data[col], errors='coerce').dropna(), bins=bins)
+    return aggregate('histogram', [col], compute, bins)
+
+def decimation_pyramid(kind, x_series, y_series, columns, aggregate=compute_directly):
+    """The LinePyramid or ScatterPyramid of two series, or None if they cannot be decimated"""
+    def compute():
+        x, y = plot_values(x_series), plot_values(y_series)
+        if x is None or y is None:
+            return None
+        return LinePyramid(x, y) if kind == "Line" else ScatterPyramid(x, y)
+    return aggregate(f"{kind.lower()}_pyramid", list(columns), compute)
+
+def column_stats(data, col, aggregate=compute_directly):
+    """Summary statistics of one column for the data preview"""
+    def compute():
+        series = data[col]
+        stats = {'count': int(series.count()), 'missing': int(series.isna().sum())}
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            stats.update(mean=series.mean(), std=series.std(), min=series.min(), max=series.max())
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            stats.update(min=series.min(), max=series.max())
+        else:
+            counts = series.value_counts()
+            stats['unique'] = len(counts)
+            if len(counts):
+                stats['top'] = f"{counts.index[0]} ({counts.iloc[0]:,})"
+        return stats
+    return aggregate('column_stats', [col], compute)
+
+def xy_series(data, col1, col2):
+    """Return the X and Y series a Line or Scatter chart plots"""
+    if col2:
+        return data[col1], data[col2]
+    return data.index.to_series(), data[col1]
+
+def draw_chart(ax, data, chart_type, col1, col2='', options=None, aggregate=compute_directly):
+    """Draw one of the CHART_TYPES for the selected columns on ax.
+
+    options overrides CHART_OPTION_DEFAULTS and aggregate(op, columns, compute, *params)
+    can memoize the aggregations. Returns the ZoomDecimator or DensityRenderer that keeps
+    the chart in step with zooming, or None. Raises ChartError for unusable selections.
+    """
+    options = {**CHART_OPTION_DEFAULTS, **(options or {})}
+    colors = CHART_COLORS
+    view_updater = None
+    
+    if chart_type == "Bar":
+        bar_values(data, col1, col2, aggregate).plot(kind='bar', ax=ax, color=colors[0])
+        if col2:
+            ax.set_ylabel(col2)
+        ax.set_xlabel(col1)
+        
+    elif chart_type == "Line":
+        if len(data) > DECIMATE_THRESHOLD:
+            x_series, y_series = xy_series(data, col1, col2)
+            pyramid = decimation_pyramid("Line", x_series, y_series, [col1, col2], aggregate)
+            view_updater = plot_decimated(ax, "Line", x_series, y_series, pyramid,
+                                          color=colors[1], label=col2 if col2 else None)
+            if view_updater and col2:
+                ax.legend()
+        if view_updater is None:
+            if col2:
+                data.plot(x=col1, y=col2, kind='line', ax=ax, color=colors[1])
+            else:
+                data[col1].plot(ax=ax, color=colors[1])
+        if col2:
+            ax.set_ylabel(col2)
+        ax.set_xlabel(col1)
+        
+    elif chart_type == "Pie":
+        value_counts(data, col1, aggregate).plot.pie(autopct='%1.1f%%', ax=ax, colors=colors)
+        ax.set_ylabel('')
+        
+    elif chart_type == "Scatter":
+        if not col2:
+            raise ChartError("Selection Error", "Scatter plot requires two columns.")
+        if options['density']:
+            view_updater = draw_density_chart(ax, data, col1, col2, options)
+        elif len(data) > DECIMATE_THRESHOLD:
+            pyramid = decimation_pyramid("Scatter", data[col1], data[col2], [col1, col2], aggregate)
+            view_updater = plot_decimated(ax, "Scatter", data[col1], data[col2], pyramid, color=colors[4], s=20)
+        if view_updater is None:
+            data.plot.scatter(x=col1, y=col2, ax=ax, color=colors[4])
+        else:
+            ax.set_xlabel(col1)
+            ax.set_ylabel(col2)
+        
+    elif chart_type == "Histogram":
+        if options['stream_path']:
+            path, bins, value_range = options['stream_path'], options['bins'], options['bin_range']
+            counts, edges = aggregate('file_histogram', [col1],
+                                      lambda: stream_histogram(path, col1, bins, value_range),
+                                      path, bins, value_range)
+        else:
+            counts, edges = histogram_counts(data, col1, options['bins'], aggregate)
+        ax.hist(edges[:-1], bins=edges, weights=counts, color=colors[2])
+        ax.set_ylabel("Frequency")
+        ax.set_xlabel(col1)
+        
+    elif chart_type == "Boxplot":
+        if options['stream_path']:
+            path = options['stream_path']
+            stats = aggregate('file_box', [col1], lambda: stream_box_stats(path, col1), path)
+        else:
+            stats = aggregate('box_stats', [col1], lambda: frame_box_stats(data[col1], col1))
+        ax.bxp([stats])
+        ax.set_ylabel(col1)
+        
+    elif chart_type == "Heatmap":
+        if options['correlation']:
+            corr = correlation_matrix(data, aggregate, options['stream_path'])
+            if corr.empty:
+                raise ChartError("Data Error", "No numeric columns for correlation heatmap.")
+            if options['cluster']:
+                order = cluster_order(corr)
+                corr = corr.iloc[order, order]
+            annotate = len(corr) <= ANNOTATE_MAX_COLUMNS
+            sns.heatmap(corr, annot=annotate, fmt=".2f", cmap='coolwarm', vmin=-1, vmax=1, ax=ax)
+        else:
+            if not col2:
+                raise ChartError("Selection Error", "Heatmap requires X and Y columns.")
+            view_updater = draw_density_chart(ax, data, col1, col2, options)
+    
+    else:
+        raise ChartError("Selection Error", f"Unknown chart type '{chart_type}'.")
+    
+    return view_updater
+
+def draw_density_chart(ax, data, col1, col2, options):
+    """Draw the density image of two columns using the value column and statistic in options"""
+    value_column, stat = options['value_column'], options['stat']
+    if stat != "count" and not value_column:
+        raise ChartError("Selection Error", f"The '{stat}' statistic needs a value column.")
+    
+    value_series = data[value_column] if value_column and stat != "count" else None
+    renderer = plot_density(ax, data[col1], data[col2], value_series, stat, options['log_scale'])
+    if renderer is None:
+        raise ChartError("Data Error", "Density charts need numeric or date columns.")
+    
+    ax.set_xlabel(col1)
+    ax.set_ylabel(col2)
+    return renderer
+
+def style_chart(ax, chart_type, col1):
+    ax.set_title(f"{chart_type} Chart of {col1}", fontsize=14, fontweight='bold', color='#2c3e50')
+    ax.set_facecolor('#f8f9fa')
+
+def format_load_progress(file_path, rows, bytes_read, total_bytes, elapsed):
+    """Build the status bar text for an in-flight load"""
+    mb_read = bytes_read / 1e6
+    mb_total = total_bytes / 1e6
+    throughput = mb_read / elapsed if elapsed > 0 else 0.0
+    percent = 100.0 * bytes_read / total_bytes if total_bytes else 100.0
+    return (f"Loading {os.path.basename(file_path)}: {rows:,} rows, "
+            f"{mb_read:,.1f}/{mb_total:,.1f} MB ({percent:.0f}%) at {throughput:,.1f} MB/s")
 
 class DataVisualizer:
-    def __init__(self, root):
+    def __init__(self, root, measure_startup=False, trace_path=None):
         self.root = root
+        self.measure_startup = measure_startup
+        self.trace_log = TraceLog(trace_path)
+        self.stage_timer = None
+        self.startup_times = {}
         self.data = None
         self.fig = None
         self.canvas = None
         self.toolbar = None
         self.is_fullscreen = False
         self.original_geometry = None
+        self.file_path = None
+        self.task = None
+        self.load_cache = LoadCache()
+        self.view_updater = None
+        self.chart_state = None
+        self.blit_manager = None
+        self.data_version = 0
+        self.aggregation_cache = AggregationCache()
+        self.loaded_bytes = None
+        self.column_memory = None
+        self.memory_baseline = None
+        self.file_columns = None
+        self.load_compact = False
+        self.ingest_state = None
+        self.tail = None
+        self.running_aggregates = None
+        self.follow_job = None
+        self.follow_task = None
+        self.pending_rows = []
+        self.pending_count = 0
+        self.warm_up = None
         self.setup_ui()
+        self.root.after_idle(self.on_first_frame)
+    
+    def on_first_frame(self):
+        """Start importing pandas, numpy, matplotlib and seaborn in the background once the window is up"""
+        self.startup_times['window'] = time.perf_counter() - STARTED_AT
+        self.warm_up = threading.Thread(target=warm_up_imports, daemon=True)
+        self.warm_up.start()
+        if self.measure_startup:
+            self.root.after(50, self.poll_warm_up)
+    
+    def poll_warm_up(self):
+        if self.warm_up.is_alive():
+            self.root.after(50, self.poll_warm_up)
+            return
+        self.startup_times['imports'] = time.perf_counter() - STARTED_AT
+        print(f"Startup: window shown after {self.startup_times['window']:.3f}s, "
+              f"plotting libraries ready after {self.startup_times['imports']:.3f}s")
+        self.root.destroy()
         
     def setup_ui(self):
         self.root.title(" Data Visualizer")
@@ -66,27 +2122,66 @@ class DataVisualizer:
         file_frame = ttk.LabelFrame(left_panel, text=" Data Input ", padding="10")
         file_frame.pack(fill=tk.X, pady=5)
         
-        load_btn = ttk.Button(file_frame, text="📁 Load Data File", command=self.load_file, style="Header.TButton")
-        load_btn.pack(pady=5)
+        load_row = ttk.Frame(file_frame)
+        load_row.pack(fill=tk.X)
+        
+        load_btn = ttk.Button(load_row, text="📁 Load Data File", command=self.load_file, style="Header.TButton")
+        load_btn.pack(side=tk.LEFT, pady=5)
+        
+        self.cancel_btn = ttk.Button(load_row, text="⏹ Cancel", command=self.cancel_task,
+                                     style="Action.TButton", state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        ingest_btn = ttk.Button(load_row, text="Load Folder...", command=self.ingest_files, style="Action.TButton")
+        ingest_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        cache_btn = ttk.Button(load_row, text="🗄 Cache...", command=self.show_cache, style="Action.TButton")
+        cache_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        self.use_cache_var = tk.BooleanVar(value=True)
+        cache_check = ttk.Checkbutton(load_row, text="Use load cache", variable=self.use_cache_var)
+        cache_check.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        follow_row = ttk.Frame(file_frame)
+        follow_row.pack(fill=tk.X)
+        
+        self.follow_var = tk.BooleanVar(value=False)
+        follow_check = ttk.Checkbutton(follow_row, text="Follow file (live tail)", variable=self.follow_var,
+                                       command=self.toggle_follow)
+        follow_check.pack(side=tk.LEFT, padx=(0, 5))
+        
+        ttk.Label(follow_row, text="Refresh every (s):").pack(side=tk.LEFT, padx=5)
+        self.follow_interval_var = tk.StringVar(value="2")
+        interval_spin = ttk.Spinbox(follow_row, from_=0.5, to=60, increment=0.5,
+                                    textvariable=self.follow_interval_var, width=6)
+        interval_spin.pack(side=tk.LEFT, padx=5)
+        
+        memory_row = ttk.Frame(file_frame)
+        memory_row.pack(fill=tk.X)
+        
+        self.compact_var = tk.BooleanVar(value=False)
+        compact_check = ttk.Checkbutton(memory_row, text="Compact dtypes", variable=self.compact_var)
+        compact_check.pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.choose_columns_var = tk.BooleanVar(value=False)
+        columns_check = ttk.Checkbutton(memory_row, text="Choose columns to load", variable=self.choose_columns_var)
+        columns_check.pack(side=tk.LEFT, padx=5)
         
         preview_frame = ttk.LabelFrame(left_panel, text=" Data Preview ", padding="10")
         preview_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
+        self.preview_info_var = tk.StringVar(value="No data loaded")
+        preview_info = ttk.Label(preview_frame, textvariable=self.preview_info_var, font=("Consolas", 9))
+        preview_info.pack(fill=tk.X)
+        
         preview_container = ttk.Frame(preview_frame)
-        preview_container.pack(fill=tk.BOTH, expand=True)
-        
-        self.preview_text = scrolledtext.ScrolledText(
-            preview_container, 
-            height=8, 
-            width=80,
-            bg="#ffffff",
-            fg="#2c3e50",
-            insertbackground="#3498db",
-            selectbackground="#3498db",
-            selectforeground="white",
-            font=("Consolas", 9)
-        )
-        self.preview_text.pack(fill=tk.BOTH, expand=True)
+        preview_container.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.preview_grid = PreviewGrid(preview_container, on_column_selected=self.show_column_stats)
+        
+        self.column_stats_var = tk.StringVar(value="Click a column heading for its summary statistics")
+        column_stats_label = ttk.Label(preview_frame, textvariable=self.column_stats_var,
+                                       font=("Consolas", 9), wraplength=520, justify=tk.LEFT)
+        column_stats_label.pack(fill=tk.X)
         
         viz_frame = ttk.LabelFrame(left_panel, text=" Visualization Settings ", padding="10")
         viz_frame.pack(fill=tk.X, pady=5)
@@ -96,9 +2191,8 @@ class DataVisualizer:
         
         ttk.Label(type_frame, text="Chart Type:").grid(row=0, column=0, sticky=tk.W, padx=5)
         self.chart_type_var = tk.StringVar(value="Bar")
-        chart_types = ["Bar", "Line", "Pie", "Scatter", "Histogram", "Boxplot", "Heatmap"]
         chart_combo = ttk.Combobox(type_frame, textvariable=self.chart_type_var, 
-                                  values=chart_types, state="readonly", width=15)
+                                  values=CHART_TYPES, state="readonly", width=15)
         chart_combo.grid(row=0, column=1, sticky=tk.W, padx=5)
         chart_combo.bind('<<ComboboxSelected>>', self.on_chart_type_change)
         
@@ -113,6 +2207,9 @@ class DataVisualizer:
         self.column_choices2 = ttk.Combobox(col_frame, values=[], state="readonly", width=20)
         self.column_choices2.grid(row=0, column=3, sticky=tk.W, padx=5)
         
+        self.column_choices.bind('<<ComboboxSelected>>', self.on_columns_selected)
+        self.column_choices2.bind('<<ComboboxSelected>>', self.on_columns_selected)
+        
         self.options_frame = ttk.Frame(viz_frame)
         self.options_frame.pack(fill=tk.X, pady=5)
         
@@ -125,6 +2222,9 @@ class DataVisualizer:
         save_btn = ttk.Button(btn_frame, text="💾 Save Chart", command=self.save_chart, style="Action.TButton")
         save_btn.pack(side=tk.LEFT, padx=5)
         
+        export_btn = ttk.Button(btn_frame, text="Export...", command=self.export_charts)
+        export_btn.pack(side=tk.LEFT, padx=5)
+        
         clear_btn = ttk.Button(btn_frame, text="🗑️ Clear Chart", command=self.clear_chart, style="Action.TButton")
         clear_btn.pack(side=tk.LEFT, padx=5)
         
@@ -274,6 +2374,18 @@ class DataVisualizer:
             bins_entry = ttk.Entry(self.options_frame, textvariable=self.bins_var, width=10)
             bins_entry.grid(row=0, column=1, padx=5, sticky=tk.W)
             
+            self.add_stream_option(row=0, column=2)
+            
+            range_label = ttk.Label(self.options_frame, text="Streamed range (min:max):")
+            range_label.grid(row=1, column=0, padx=5, sticky=tk.W)
+            
+            self.bin_range_var = tk.StringVar(value="")
+            range_entry = ttk.Entry(self.options_frame, textvariable=self.bin_range_var, width=16)
+            range_entry.grid(row=1, column=1, columnspan=2, padx=5, sticky=tk.W)
+            
+        elif chart_type == "Boxplot":
+            self.add_stream_option(row=0, column=0)
+            
         elif chart_type == "Heatmap":
             corr_label = ttk.Label(self.options_frame, text="Show Correlation Matrix")
             corr_label.grid(row=0, column=0, padx=5, sticky=tk.W)
@@ -281,35 +2393,407 @@ class DataVisualizer:
             self.corr_var = tk.BooleanVar(value=True)
             corr_check = ttk.Checkbutton(self.options_frame, variable=self.corr_var)
             corr_check.grid(row=0, column=1, padx=5, sticky=tk.W)
+            
+            self.cluster_var = tk.BooleanVar(value=False)
+            cluster_check = ttk.Checkbutton(self.options_frame, text="Cluster columns", variable=self.cluster_var)
+            cluster_check.grid(row=0, column=2, padx=5, sticky=tk.W)
+            
+            self.add_stream_option(row=0, column=3)
+            
+            self.add_density_options(row=1)
+            
+        elif chart_type == "Scatter":
+            self.density_var = tk.BooleanVar(value=False)
+            density_check = ttk.Checkbutton(self.options_frame, text="Density mode", variable=self.density_var)
+            density_check.grid(row=0, column=0, columnspan=2, padx=5, sticky=tk.W)
+            
+            self.add_density_options(row=1)
+    
+    def add_stream_option(self, row, column):
+        """Add the checkbox that computes the chart from the file on disk instead of the loaded data"""
+        self.stream_var = tk.BooleanVar(value=False)
+        stream_check = ttk.Checkbutton(self.options_frame, text="Stream from file", variable=self.stream_var)
+        stream_check.grid(row=row, column=column, padx=5, sticky=tk.W)
+    
+    def add_density_options(self, row):
+        """Add the value column, statistic and log scale controls used by density charts"""
+        ttk.Label(self.options_frame, text="Value column:").grid(row=row, column=0, padx=5, sticky=tk.W)
+        columns = [''] + list(self.file_columns or self.data.columns) if self.data is not None else ['']
+        self.value_column_var = tk.StringVar(value='')
+        self.value_column_combo = ttk.Combobox(self.options_frame, textvariable=self.value_column_var,
+                                               values=columns, state="readonly", width=15)
+        self.value_column_combo.grid(row=row, column=1, padx=5, sticky=tk.W)
+        
+        ttk.Label(self.options_frame, text="Statistic:").grid(row=row, column=2, padx=5, sticky=tk.W)
+        self.density_stat_var = tk.StringVar(value="count")
+        stat_combo = ttk.Combobox(self.options_frame, textvariable=self.density_stat_var,
+                                  values=DENSITY_STATS, state="readonly", width=8)
+        stat_combo.grid(row=row, column=3, padx=5, sticky=tk.W)
+        
+        self.log_color_var = tk.BooleanVar(value=True)
+        log_check = ttk.Checkbutton(self.options_frame, text="Log color scale", variable=self.log_color_var)
+        log_check.grid(row=row + 1, column=0, columnspan=2, padx=5, sticky=tk.W)
+    
+    def run_task(self, description, work, on_done):
+        """Run work(report, cancel_event) on a worker thread and call on_done(result) on the Tk thread"""
+        if self.task is not None:
+            messagebox.showwarning("Busy", f"Please wait for '{self.task.description}' to finish or cancel it.")
+            return False
+        
+        self.task = BackgroundTask(description, work, on_done)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.status_var.set(f"{description}...")
+        self.root.after(100, self._poll_task)
+        return True
+    
+    def _poll_task(self):
+        task = self.task
+        if task is None:
+            return
+        
+        try:
+            while True:
+                kind, payload = task.messages.get_nowait()
+                if kind == 'progress':
+                    self.status_var.set(payload)
+                    continue
+                
+                self.task = None
+                self.cancel_btn.config(state=tk.DISABLED)
+                if kind == 'done':
+                    task.on_done(payload)
+                elif kind == 'cancelled':
+                    self.status_var.set(f"{task.description} cancelled")
+                else:
+                    error, details = payload
+                    self.status_var.set(f"{task.description} failed")
+                    messagebox.showerror("Error", f"{task.description} failed:\n{str(error)}")
+                    print(details)
+                return
+        except queue.Empty:
+            pass
+        
+        self.root.after(100, self._poll_task)
+    
+    def cancel_task(self):
+        """Ask the running background task to stop"""
+        if self.task is not None:
+            self.task.cancel()
+            self.status_var.set(f"Cancelling {self.task.description.lower()}...")
     
     def load_file(self):
         file_path = filedialog.askopenfilename(filetypes=[
-            ("All Data Files", "*.csv *.xlsx *.xls *.json *.txt"),
+            ("All Data Files", " ".join(f"*{extension}" for extension in DATA_EXTENSIONS)),
             ("CSV Files", "*.csv"),
             ("Excel Files", "*.xlsx *.xls"),
             ("JSON Files", "*.json"),
-            ("Text Files", "*.txt")
+            ("Text Files", "*.txt"),
+            ("Parquet Files", "*.parquet *.pq"),
+            ("Feather/Arrow Files", "*.feather *.arrow *.ipc"),
+            ("NumPy Arrays", "*.npy")
         ])
         
-        if not file_path:
-            return
-            
+        if not file_path:
+            return
+        
+        if not file_path.lower().endswith(DATA_EXTENSIONS):
+            messagebox.showerror("Unsupported Format", "File format not supported.")
+            return
+        
+        usecols = None
+        if self.choose_columns_var.get():
+            usecols = self.choose_columns(file_path)
+            if usecols is None:
+                return
+        
+        file_columns = None
+        if is_columnar(file_path):
+            try:
+                file_columns = usecols or peek_columns(file_path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read the column names:\n{str(e)}")
+                return
+            usecols = file_columns[:2]
+        
+        compact = self.compact_var.get()
+        use_cache = self.use_cache_var.get() and file_columns is None
+        options = csv_options(file_path)
+        if usecols:
+            options['usecols'] = usecols
+        if compact:
+            options['compact'] = True
+        baseline = {} if compact else None
+        timer = StageTimer('load', file=file_path, compact=compact, columns=usecols or None)
+        
+        def work(report, cancel_event):
+            started = time.perf_counter()
+            
+            if use_cache:
+                loaded_bytes = os.path.getsize(file_path)
+                with timer.stage('cache_read'):
+                    data = self.load_cache.get(file_path, options)
+                if data is not None:
+                    return data, f"from cache in {time.perf_counter() - started:.1f}s", loaded_bytes
+            
+            consumed = [None]
+            
+            def progress(rows, bytes_read, total_bytes):
+                consumed[0] = bytes_read
+                elapsed = time.perf_counter() - started
+                report(format_load_progress(file_path, rows, bytes_read, total_bytes, elapsed))
+            
+            with timer.stage('parse'):
+                data = read_data_file(file_path, progress=progress, cancel_event=cancel_event,
+                                      usecols=usecols, compact=compact, baseline=baseline)
+            parse_seconds = time.perf_counter() - started
+            if use_cache:
+                report(f"Writing {os.path.basename(file_path)} to the load cache...")
+                try:
+                    with timer.stage('cache_write'):
+                        self.load_cache.put(file_path, options, data)
+                except Exception:
+                    print(traceback.format_exc())
+            return data, f"parsed in {parse_seconds:.1f}s", consumed[0]
+        
+        def on_done(result):
+            self.memory_baseline = baseline or None
+            self.load_compact = compact
+            timer.details['rows'] = len(result[0])
+            with timer.stage('widgets'):
+                self.on_data_loaded(result[0], file_path, *result[1:], file_columns=file_columns)
+            self.report_stages(timer)
+        
+        self.run_task("Loading data", work, on_done)
+    
+    def ingest_files(self):
+        """Ask for a folder or glob pattern and load every data file it names as one dataset"""
+        window = tk.Toplevel(self.root)
+        window.title("Load Folder")
+        window.transient(self.root)
+        
+        frame = ttk.Frame(window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(frame, text="Folder or glob pattern (e.g. data/2024-*.csv):").grid(row=0, column=0, columnspan=2,
+                                                                                    sticky=tk.W, padx=5)
+        pattern_var = tk.StringVar(value=self.ingest_state['pattern'] if self.ingest_state else "")
+        ttk.Entry(frame, textvariable=pattern_var, width=50).grid(row=1, column=0, sticky=tk.EW, padx=5, pady=5)
+        ttk.Button(frame, text="Browse...",
+                   command=lambda: pattern_var.set(filedialog.askdirectory(parent=window) or pattern_var.get())
+                   ).grid(row=1, column=1, padx=5)
+        
+        def start():
+            pattern = pattern_var.get().strip()
+            if not pattern:
+                return
+            window.destroy()
+            self.start_ingest(pattern)
+        
+        btn_frame = ttk.Frame(frame)
+        btn_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(10, 0))
+        ttk.Button(btn_frame, text="Load", command=start, style="Action.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+        window.grab_set()
+    
+    def start_ingest(self, pattern):
+        """Parse the files named by pattern across a process pool and combine them into one dataset.
+        
+        Files ingested before from the same pattern with the same size and modification
+        time are not parsed again; their rows are taken from the current dataset and
+        cast back to the columns and dtypes the file had on its own.
+        """
+        paths = expand_sources(pattern)
+        if not paths:
+            messagebox.showwarning("No Files", f"No supported data files match:\n{pattern}")
+            return
+        
+        compact = self.compact_var.get()
+        labels = source_labels(paths)
+        old_data = self.data
+        previous = {}
+        state = self.ingest_state
+        if state and state['compact'] == compact and old_data is not None and SOURCE_COLUMN in old_data.columns:
+            positions = old_data.groupby(SOURCE_COLUMN, observed=True).indices
+            for path in paths:
+                fingerprint, label, dtypes = state['files'].get(path, (None, None, None))
+                if (label in positions and file_fingerprint(path) == fingerprint
+                        and dtypes.index.isin(old_data.columns).all()):
+                    previous[path] = (fingerprint, positions[label], dtypes)
+        
+        timer = StageTimer('ingest', pattern=pattern, files=len(paths), unchanged=len(previous))
+        
+        def work(report, cancel_event):
+            frames, fingerprints, errors = {}, {}, {}
+            for path, (fingerprint, rows, dtypes) in previous.items():
+                # The combined frame holds the union of all files' columns, with ints widened
+                # to float wherever another file lacked them
+                frames[path] = old_data.iloc[rows][list(dtypes.index)].astype(dtypes.to_dict())
+                fingerprints[path] = fingerprint
+            
+            pending = [path for path in paths if path not in frames]
+            with timer.stage('parse'):
+                if pending:
+                    workers = min(len(pending), os.cpu_count() or 1)
+                    context = multiprocessing.get_context('spawn')
+                    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                        futures = {pool.submit(ingest_file, path, compact): path for path in pending}
+                        for done, future in enumerate(as_completed(futures), start=1):
+                            if cancel_event.is_set():
+                                pool.shutdown(cancel_futures=True)
+                                raise TaskCancelled()
+                            path = futures[future]
+                            try:
+                                frames[path], fingerprints[path], seconds = future.result()
+                                outcome = f"{labels[path]}: {len(frames[path]):,} rows in {seconds:.1f}s"
+                            except Exception as e:
+                                errors[path] = f"{type(e).__name__}: {e}"
+                                outcome = f"{labels[path]} failed ({errors[path]})"
+                            report(f"Loading {done}/{len(pending)} files, {len(errors)} failed - {outcome}")
+            
+            if not frames:
+                raise ValueError("None of the files could be read:\n" +
+                                 "\n".join(f"{labels[path]}: {error}" for path, error in errors.items()))
+            with timer.stage('combine'):
+                data = combine_sources({path: frames[path] for path in paths if path in frames}, labels)
+            schemas = {path: frame.dtypes for path, frame in frames.items()}
+            return data, fingerprints, schemas, errors
+        
+        def on_done(result):
+            data, fingerprints, schemas, errors = result
+            self.memory_baseline = None
+            self.load_compact = compact
+            note = f"{len(fingerprints)}/{len(paths)} files, {len(previous)} unchanged"
+            if errors:
+                note += f", {len(errors)} failed"
+            timer.details['rows'] = len(data)
+            with timer.stage('widgets'):
+                self.on_data_loaded(data, pattern, note)
+            self.ingest_state = {'pattern': pattern, 'compact': compact,
+                                 'files': {path: (fingerprints[path], labels[path], schemas[path])
+                                           for path in fingerprints}}
+            self.report_stages(timer)
+            if errors:
+                details = "\n".join(f"{labels[path]}: {error}" for path, error in list(errors.items())[:10])
+                messagebox.showwarning("Some Files Failed", f"{len(errors)} file(s) could not be read:\n{details}")
+        
+        self.run_task(f"Loading {len(paths)} files", work, on_done)
+    
+    def choose_columns(self, file_path):
+        """Ask which columns to load; return the selection, or None if the load was cancelled"""
+        try:
+            columns = peek_columns(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read the column names:\n{str(e)}")
+            return None
+        if columns is None:
+            messagebox.showinfo("Choose Columns", "JSON files are loaded in full; all columns will be kept.")
+            return []
+        
+        window = tk.Toplevel(self.root)
+        window.title("Choose Columns")
+        window.geometry("320x400")
+        window.transient(self.root)
+        
+        frame = ttk.Frame(window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text="Columns to load:").pack(anchor=tk.W)
+        
+        listbox = tk.Listbox(frame, selectmode=tk.MULTIPLE, exportselection=False, font=("Consolas", 9))
+        for column in columns:
+            listbox.insert(tk.END, column)
+        listbox.select_set(0, tk.END)
+        listbox.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        selection = [None]
+        
+        def accept():
+            chosen = [columns[i] for i in listbox.curselection()]
+            if not chosen:
+                messagebox.showwarning("Selection Error", "Please select at least one column.", parent=window)
+                return
+            selection[0] = chosen if len(chosen) < len(columns) else []
+            window.destroy()
+        
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(fill=tk.X)
+        ttk.Button(btn_frame, text="Load", command=accept, style="Action.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+        
+        window.grab_set()
+        self.root.wait_window(window)
+        return selection[0]
+    
+    def show_cache(self):
+        """Show what the load cache holds and offer to clear it"""
+        window = tk.Toplevel(self.root)
+        window.title("Load Cache")
+        window.geometry("700x300")
+        
+        frame = ttk.Frame(window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        summary_var = tk.StringVar()
+        ttk.Label(frame, textvariable=summary_var).pack(fill=tk.X, pady=(0, 5))
+        
+        columns = ("source", "rows", "size", "last_used")
+        tree = ttk.Treeview(frame, columns=columns, show="headings", height=8)
+        for column, heading, width in zip(columns, ("File", "Rows", "Size (MB)", "Last Used"), (340, 90, 90, 140)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor=tk.W)
+        tree.pack(fill=tk.BOTH, expand=True)
+        
+        def refresh():
+            tree.delete(*tree.get_children())
+            entries = self.load_cache.entries()
+            for entry in entries:
+                tree.insert("", tk.END, values=(
+                    entry['source'],
+                    f"{entry['rows']:,}",
+                    f"{entry['bytes'] / 1e6:,.1f}",
+                    datetime.fromtimestamp(entry['last_used']).strftime("%Y-%m-%d %H:%M"),
+                ))
+            total = sum(entry['bytes'] for entry in entries)
+            summary_var.set(f"{len(entries)} cached file(s), {total / 1e6:,.1f} MB of "
+                            f"{self.load_cache.max_bytes / 1e6:,.0f} MB in {self.load_cache.cache_dir}")
+        
+        def clear():
+            if messagebox.askyesno("Clear Cache", "Remove all cached data files?", parent=window):
+                self.load_cache.clear()
+                refresh()
+                self.status_var.set("Load cache cleared")
+        
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(fill=tk.X, pady=(5, 0))
+        ttk.Button(btn_frame, text="🗑️ Clear Cache", command=clear, style="Action.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Close", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+        
+        refresh()
+    
+    def on_data_loaded(self, data, file_path, load_note=None, loaded_bytes=None, file_columns=None):
+        """Swap in a freshly loaded dataset and refresh the column pickers and preview.
+        
+        file_columns lists every column of a columnar file when only some were loaded;
+        the rest are read on demand by ensure_columns.
+        """
         try:
-            if file_path.endswith('.csv'):
-                self.data = pd.read_csv(file_path)
-            elif file_path.endswith(('.xlsx', '.xls')):
-                self.data = pd.read_excel(file_path)
-            elif file_path.endswith('.json'):
-                self.data = pd.read_json(file_path)
-            elif file_path.endswith('.txt'):
-                self.data = pd.read_csv(file_path, sep=None, engine='python')
-            else:
-                messagebox.showerror("Unsupported Format", "File format not supported.")
-                return
-
-            columns = list(self.data.columns)
+            if self.tail is not None:
+                self.stop_follow()
+                self.follow_var.set(False)
+            
+            self.data = data
+            self.file_path = file_path
+            self.loaded_bytes = loaded_bytes
+            self.file_columns = file_columns
+            self.ingest_state = None
+            self.column_memory = self.data.memory_usage(deep=True, index=False)
+            self.data_version += 1
+            self.aggregation_cache.invalidate()
+            
+            columns = file_columns or list(self.data.columns)
             self.column_choices['values'] = columns
             self.column_choices2['values'] = columns
+            if hasattr(self, 'value_column_combo') and self.value_column_combo.winfo_exists():
+                self.value_column_combo['values'] = [''] + columns
             
             if len(columns) > 0:
                 self.column_choices.set(columns[0])
@@ -320,7 +2804,12 @@ class DataVisualizer:
             
             self.update_preview()
             
-            self.status_var.set(f"Loaded {file_path} - {len(self.data)} rows, {len(columns)} columns")
+            status = f"Loaded {file_path} - {len(self.data)} rows, {len(columns)} columns"
+            if file_columns:
+                status += f" ({len(self.data.columns)} read, the rest on demand)"
+            if load_note:
+                status += f" ({load_note})"
+            self.status_var.set(status)
             
         except Exception as e:
             error_msg = f"Failed to load file:\n{str(e)}"
@@ -328,15 +2817,218 @@ class DataVisualizer:
             messagebox.showerror("Error", error_msg)
             print(traceback.format_exc())
     
-    def update_preview(self):
+    def toggle_follow(self):
+        if self.follow_var.get():
+            if not self.start_follow():
+                self.follow_var.set(False)
+        else:
+            self.stop_follow()
+            self.status_var.set("Stopped following file")
+    
+    def start_follow(self):
+        """Begin polling the loaded CSV/TXT file for appended rows"""
+        if self.data is None or not self.file_path or self.loaded_bytes is None:
+            messagebox.showwarning("No Data", "Please load a CSV or TXT file first.")
+            return False
+        if not self.file_path.endswith(('.csv', '.txt')):
+            messagebox.showwarning("Unsupported Format", "Only CSV and TXT files can be followed.")
+            return False
+        
+        self.tail = TailReader(self.file_path, self.loaded_bytes, self.data.columns)
+        self.running_aggregates = RunningAggregates()
+        self.status_var.set(f"Following {os.path.basename(self.file_path)} for appended rows")
+        self.follow_job = self.root.after(self.follow_interval_ms(), self.poll_follow)
+        return True
+    
+    def stop_follow(self):
+        if self.follow_job is not None:
+            self.root.after_cancel(self.follow_job)
+            self.follow_job = None
+        self.flush_appended()
+        if self.tail is not None:
+            self.loaded_bytes = self.tail.offset
+        self.tail = None
+        self.follow_task = None
+        self.running_aggregates = None
+    
+    def follow_interval_ms(self):
+        try:
+            return max(int(float(self.follow_interval_var.get()) * 1000), 100)
+        except ValueError:
+            return 2000
+    
+    def poll_follow(self):
+        """Read appended rows on a worker thread and apply them once it finishes"""
+        self.follow_job = None
+        if self.tail is None:
+            return
+        
+        if self.follow_task is None:
+            tail = self.tail
+            self.follow_task = BackgroundTask("Reading appended rows",
+                                              lambda report, cancel_event: tail.read_new(), None)
+        try:
+            kind, payload = self.follow_task.messages.get_nowait()
+        except queue.Empty:
+            self.follow_job = self.root.after(FOLLOW_CHECK_MS, self.poll_follow)
+            return
+        self.follow_task = None
+        
+        try:
+            if kind == 'error':
+                raise payload[0]
+            rows, self.tail.offset = payload
+            if rows is not None and len(rows):
+                self.append_rows(rows)
+        except FileTruncated:
+            self.stop_follow()
+            self.follow_var.set(False)
+            self.status_var.set(f"{os.path.basename(self.file_path)} was truncated - reload it to continue")
+            return
+        except Exception as e:
+            self.stop_follow()
+            self.follow_var.set(False)
+            self.status_var.set("Following stopped")
+            messagebox.showerror("Follow Error", f"Failed to read appended rows:\n{str(e)}")
+            print(payload[1] if kind == 'error' else traceback.format_exc())
+            return
+        
+        self.follow_job = self.root.after(self.follow_interval_ms(), self.poll_follow)
+    
+    def append_rows(self, rows):
+        """Buffer appended rows, fold them into the running aggregates and refresh the chart.
+        
+        The rows are concatenated into self.data in batches by flush_appended, once they
+        add up to FOLLOW_FLUSH_RATIO of the loaded rows, instead of copying the whole
+        frame on every poll.
+        """
+        start = len(self.data) + self.pending_count
+        rows = align_dtypes(rows, self.data)
+        rows.index = pd.RangeIndex(start, start + len(rows))
+        self.pending_rows.append(rows)
+        self.pending_count += len(rows)
+        self.data_version += 1
+        
+        self.running_aggregates.update(rows)
+        self.store_running_results()
+        
+        if self.pending_count >= FOLLOW_FLUSH_RATIO * len(self.data):
+            self.flush_appended()
+        if self.chart_state is not None and not self.extend_chart(rows):
+            self.flush_appended()
+            chart_type, (col1, col2) = self.chart_state['type'], self.chart_state['columns']
+            self.render_chart(chart_type, col1, col2)
+        
+        self.status_var.set(f"Following {os.path.basename(self.file_path)}: +{len(rows):,} rows, "
+                            f"{start + len(rows):,} total")
+    
+    def store_running_results(self):
+        """Replace the cached aggregations with the running ones for the current data version"""
+        self.aggregation_cache.invalidate()
+        if self.running_aggregates is not None:
+            for op, columns, params, result in self.running_aggregates.results():
+                self.aggregation_cache.put((self.data_version, op, tuple(columns), params), result)
+    
+    def flush_appended(self):
+        """Concatenate the buffered appended rows into self.data"""
+        if not self.pending_rows:
+            return
+        self.data = concat_frames([self.data] + self.pending_rows)
+        self.pending_rows = []
+        self.pending_count = 0
+        self.data_version += 1
+        self.store_running_results()
+        self.update_preview(keep_position=True)
+    
+    def chart_aggregation(self, chart_type, col1, col2):
+        """The (op, columns, params) a chart is drawn from, for charts a running aggregate can serve"""
+        if chart_type == "Bar":
+            return ('groupby_mean', (col1, col2), ()) if col2 else ('value_counts', (col1,), ())
+        if chart_type == "Pie":
+            return ('value_counts', (col1,), ())
+        if chart_type == "Histogram":
+            return ('histogram', (col1,), (self.histogram_bins(),))
+        if chart_type == "Heatmap" and self.corr_var.get():
+            return ('corr', (), ())
+        return None
+    
+    def extend_chart(self, rows):
+        """Bring the chart up to date with appended rows without recomputing it from all the data.
+        
+        Decimated Line and Scatter charts extend their pyramid with the new points, and
+        charts drawn from a running aggregate are redrawn from the cache. Returns False
+        when the chart has to be rebuilt from the full data.
+        """
+        chart_type, (col1, col2) = self.chart_state['type'], self.chart_state['columns']
+        if chart_type in ("Line", "Scatter"):
+            mode = self.chart_state['mode']
+            if mode is None or not mode[2] or not isinstance(self.view_updater, ZoomDecimator):
+                return False
+            x_series, y_series = xy_series(rows, col1, col2)
+            x, y = plot_values(x_series), plot_values(y_series)
+            if x is None or y is None or not self.view_updater.extend(x, y):
+                return False
+            self.canvas.draw_idle()
+            return True
+        
+        key = self.chart_aggregation(chart_type, col1, col2)
+        if key is None or key not in self.running_aggregates.state:
+            return False
+        self.render_chart(chart_type, col1, col2)
+        return True
+    
+    def update_preview(self, keep_position=False):
         if self.data is not None:
-            preview_content = f"Data Shape: {self.data.shape}\n\n"
-            preview_content += f"Columns: {list(self.data.columns)}\n\n"
-            preview_content += "First 10 rows:\n"
-            preview_content += self.data.head(10).to_string()
-            
-            self.preview_text.delete(1.0, tk.END)
-            self.preview_text.insert(tk.END, preview_content)
+            rows, columns = self.data.shape
+            info = f"{rows:,} rows x {columns:,} columns"
+            if self.file_columns and columns < len(self.file_columns):
+                info += f" (of {len(self.file_columns):,} in the file)"
+            self.preview_info_var.set(info + self.memory_summary())
+            self.preview_grid.set_data(self.data, keep_position, self.column_notes())
+            if not keep_position:
+                self.column_stats_var.set("Click a column heading for its summary statistics")
+    
+    def memory_summary(self):
+        """Describe the dataset's memory footprint at load time and the savings over a plain load"""
+        if self.column_memory is None:
+            return ""
+        
+        total = self.column_memory.sum()
+        summary = f" | {total / 1e6:,.1f} MB at load"
+        if self.memory_baseline:
+            plain = sum(self.memory_baseline.get(col, 0) for col in self.column_memory.index)
+            if plain:
+                summary += f" (plain ~{plain / 1e6:,.1f} MB, {100 * (1 - total / plain):.0f}% saved)"
+        return summary
+    
+    def column_notes(self):
+        """Each column's dtype and memory at load, with the change from a plain load, for the preview grid"""
+        notes = {}
+        for col, dtype in self.data.dtypes.items():
+            note = str(dtype)
+            if self.column_memory is not None and col in self.column_memory.index:
+                size = self.column_memory[col]
+                note += f", {size / 1e6:,.2f} MB"
+                plain = self.memory_baseline.get(col) if self.memory_baseline else None
+                if plain:
+                    note += f" ({100 * (size / plain - 1):+.0f}%)"
+            notes[col] = note
+        return notes
+    
+    def show_column_stats(self, col):
+        """Show a column's dtype, memory and summary statistics below the preview grid"""
+        self.flush_appended()
+        stats = column_stats(self.data, col, self.aggregate)
+        parts = [f"{col} ({self.data[col].dtype})"]
+        if self.column_memory is not None and col in self.column_memory.index:
+            memory = f"{self.column_memory[col] / 1e6:,.2f} MB"
+            if self.memory_baseline and col in self.memory_baseline:
+                memory += f" (plain ~{self.memory_baseline[col] / 1e6:,.2f} MB)"
+            parts.append(memory)
+        for name, value in stats.items():
+            text = f"{value:,}" if isinstance(value, int) else PreviewGrid.format_cell(value)
+            parts.append(f"{name}: {text}")
+        self.column_stats_var.set(" | ".join(parts))
     
     def plot_chart(self):
         if self.data is None:
@@ -345,95 +3037,369 @@ class DataVisualizer:
             
         chart_type = self.chart_type_var.get()
         col1 = self.column_choices.get()
+        col2 = self.column_choices2.get()
         
         if not col1:
             messagebox.showwarning("Selection Error", "Please select at least one column.")
             return
+        
+        self.flush_appended()
+        if self.streaming_from_file():
+            self.stream_chart(chart_type, col1, col2)
+            return
+        
+        needed = [col1, col2]
+        if hasattr(self, 'value_column_var'):
+            needed.append(self.value_column_var.get())
+        self.ensure_columns(needed, lambda: self.render_chart(chart_type, col1, col2))
+    
+    def on_columns_selected(self, event):
+        if self.task is None:
+            self.ensure_columns([self.column_choices.get(), self.column_choices2.get()])
+    
+    def ensure_columns(self, columns, on_ready=None):
+        """Read columns of a columnar file that have not been loaded yet, and only those.
+        
+        The columns are read in a background task; on_ready() is called once they are
+        in self.data, straight away if nothing is missing.
+        """
+        missing = []
+        if self.file_columns and self.data is not None:
+            missing = [col for col in dict.fromkeys(columns)
+                       if col in self.file_columns and col not in self.data.columns]
+        if not missing:
+            if on_ready:
+                on_ready()
+            return
+        
+        data, file_path, compact = self.data, self.file_path, self.load_compact
+        timer = StageTimer('project', file=file_path, columns=missing)
+        
+        def work(report, cancel_event):
+            with timer.stage('read'):
+                frame = read_columnar(file_path, missing)
+                if compact:
+                    frame = compact_frame(frame)
+            return frame
+        
+        def on_done(frame):
+            if self.data is not data:
+                return
+            with timer.stage('widgets'):
+                for col in missing:
+                    self.data[col] = frame[col].array
+                self.column_memory = pd.concat([self.column_memory, frame.memory_usage(deep=True, index=False)])
+                self.update_preview(keep_position=True)
+            self.status_var.set(f"Read {', '.join(map(str, missing))} from {os.path.basename(file_path)}")
+            self.report_stages(timer)
+            if on_ready:
+                on_ready()
+        
+        self.run_task(f"Reading {', '.join(map(str, missing))}", work, on_done)
+    
+    def stream_chart(self, chart_type, col1, col2):
+        """Compute a chart's aggregation from the file in a background task, then draw it from the cache"""
+        file_path = self.file_path
+        try:
+            options = self.chart_options()
+        except ValueError as e:
+            messagebox.showwarning("Invalid Option", str(e))
+            return
+        
+        if chart_type == "Heatmap":
+            key = (self.data_version, 'file_corr', (), (file_path,))
+            compute = lambda progress, cancel_event: stream_correlation(file_path, progress, cancel_event)
+        elif chart_type == "Histogram":
+            key = (self.data_version, 'file_histogram', (col1,), (file_path, options['bins'], options['bin_range']))
+            compute = lambda progress, cancel_event: stream_histogram(file_path, col1, options['bins'],
+                                                                      options['bin_range'], progress, cancel_event)
+        else:
+            key = (self.data_version, 'file_box', (col1,), (file_path,))
+            compute = lambda progress, cancel_event: stream_box_stats(file_path, col1, progress, cancel_event)
+        
+        if key in self.aggregation_cache.entries:
+            self.render_chart(chart_type, col1, col2)
+            return
+        
+        def work(report, cancel_event):
+            started = time.perf_counter()
             
-        self.clear_chart()
+            def progress(rows, bytes_read, total_bytes):
+                report(format_load_progress(file_path, rows, bytes_read, total_bytes,
+                                            time.perf_counter() - started))
+            
+            return compute(progress, cancel_event)
+        
+        def on_done(result):
+            self.aggregation_cache.put(key, result)
+            self.render_chart(chart_type, col1, col2)
         
+        self.run_task(f"Streaming {chart_type.lower()} from file", work, on_done)
+    
+    def render_chart(self, chart_type, col1, col2):
+        """Update the current chart in place when possible, otherwise redraw it"""
+        timer = StageTimer('plot', chart=chart_type, columns=[col1, col2], rows=len(self.data))
+        self.stage_timer = timer
         try:
-            plt.style.use('default')
-            self.fig, ax = plt.subplots(figsize=(10, 6))
+            self.ensure_surface()
+            hits, misses = self.aggregation_cache.hits, self.aggregation_cache.misses
             
-            colors = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#34495e']
+            with timer.stage('update'):
+                updated = self.update_chart_in_place(chart_type, col1, col2)
+            if updated:
+                self.status_var.set(f"Updated {chart_type} chart - Use scrollbars to navigate"
+                                    f"{self.aggregation_note(hits, misses)}")
+                self.report_stages(timer)
+                return
             
-            if chart_type == "Bar":
-                col2 = self.column_choices2.get()
-                if col2:
-                    self.data.groupby(col1)[col2].mean().plot(kind='bar', ax=ax, color=colors[0])
-                    ax.set_ylabel(col2)
-                else:
-                    self.data[col1].value_counts().plot(kind='bar', ax=ax, color=colors[0])
-                ax.set_xlabel(col1)
-                
-            elif chart_type == "Line":
-                col2 = self.column_choices2.get()
-                if col2:
-                    self.data.plot(x=col1, y=col2, kind='line', ax=ax, color=colors[1])
-                    ax.set_ylabel(col2)
-                else:
-                    self.data[col1].plot(ax=ax, color=colors[1])
-                ax.set_xlabel(col1)
-                
-            elif chart_type == "Pie":
-                self.data[col1].value_counts().plot.pie(autopct='%1.1f%%', ax=ax, colors=colors)
-                ax.set_ylabel('')
-                
-            elif chart_type == "Scatter":
-                col2 = self.column_choices2.get()
-                if not col2:
-                    messagebox.showwarning("Selection Error", "Scatter plot requires two columns.")
-                    return
-                self.data.plot.scatter(x=col1, y=col2, ax=ax, color=colors[4])
-                
-            elif chart_type == "Histogram":
-                bins = int(self.bins_var.get()) if hasattr(self, 'bins_var') else 10
-                self.data[col1].plot.hist(bins=bins, ax=ax, color=colors[2])
-                ax.set_xlabel(col1)
-                
-            elif chart_type == "Boxplot":
-                self.data[col1].plot.box(ax=ax)
-                ax.set_ylabel(col1)
-                
-            elif chart_type == "Heatmap":
-                if hasattr(self, 'corr_var') and self.corr_var.get():
-                    numeric_data = self.data.select_dtypes(include=[np.number])
-                    if numeric_data.empty:
-                        messagebox.showwarning("Data Error", "No numeric columns for correlation heatmap.")
-                        return
-                    corr = numeric_data.corr()
-                    sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax)
-                else:
-                    messagebox.showwarning("Not Implemented", "General heatmap not yet implemented.")
-                    return
+            self.reset_figure()
+            ax = self.fig.add_subplot(111)
+            mode = self.chart_mode(chart_type, col1, col2)
             
-            ax.set_title(f"{chart_type} Chart of {col1}", fontsize=14, fontweight='bold', color='#2c3e50')
-            ax.set_facecolor('#f8f9fa')
-            self.fig.patch.set_facecolor('#ffffff')
-            plt.tight_layout()
+            try:
+                with timer.stage('draw'):
+                    self.view_updater = draw_chart(ax, self.data, chart_type, col1, col2,
+                                                   self.chart_options(), self.aggregate)
+                    style_chart(ax, chart_type, col1)
+            except ChartError as e:
+                self.canvas.draw_idle()
+                messagebox.showwarning(e.title, str(e))
+                return
             
-            self.canvas = FigureCanvasTkAgg(self.fig, master=self.scrollable_frame)
-            self.canvas.draw()
-            self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            with timer.stage('tight_layout'):
+                self.fig.tight_layout()
             
-            self.toolbar = NavigationToolbar2Tk(self.canvas, self.scrollable_frame)
-            self.toolbar.update()
-            self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+            self.chart_state = {'type': chart_type, 'columns': (col1, col2), 'mode': mode, 'ax': ax,
+                                'artists': self.chart_artists(chart_type, ax)}
+            artists = list(self.chart_state['artists'])
+            if ax.get_legend() is not None:
+                artists.append(ax.get_legend())
+            self.blit_manager.set_artists(artists if mode is not None else [])
             
-            self.scrollable_frame.update_idletasks()
-            self.chart_canvas.configure(scrollregion=self.chart_canvas.bbox("all"))
+            with timer.stage('canvas.draw'):
+                self.canvas.draw()
             
-            self.status_var.set(f"Generated {chart_type} chart - Use scrollbars to navigate")
+            with timer.stage('widgets'):
+                self.toolbar.update()
+                self.scrollable_frame.update_idletasks()
+                self.chart_canvas.configure(scrollregion=self.chart_canvas.bbox("all"))
+            
+            self.status_var.set(f"Generated {chart_type} chart - Use scrollbars to navigate"
+                                f"{self.aggregation_note(hits, misses)}")
+            self.report_stages(timer)
             
         except Exception as e:
             error_msg = f"Error creating chart:\n{str(e)}"
             self.status_var.set("Chart generation failed")
             messagebox.showerror("Plot Error", error_msg)
             print(traceback.format_exc())
+        finally:
+            self.stage_timer = None
+    
+    def report_stages(self, timer):
+        """Append a timer's stage breakdown to the status bar and write it to the trace log"""
+        self.status_var.set(f"{self.status_var.get()} | {timer.summary()}")
+        self.trace_log.write(timer)
+    
+    def aggregate(self, op, columns, compute, *params):
+        """Return compute() memoized for this dataset version, operation, columns and parameters"""
+        key = (self.data_version, op, tuple(columns), params)
+        if self.running_aggregates is not None:
+            self.running_aggregates.track(op, columns, params, self.data)
+        if self.stage_timer is None:
+            return self.aggregation_cache.get(key, compute)
+        
+        started = time.perf_counter()
+        try:
+            return self.aggregation_cache.get(key, compute)
+        finally:
+            self.stage_timer.add('aggregate', time.perf_counter() - started)
+    
+    def aggregation_note(self, hits, misses):
+        """Describe cache use since the given hit/miss counts, for the status bar"""
+        new_hits = self.aggregation_cache.hits - hits
+        new_misses = self.aggregation_cache.misses - misses
+        if not new_hits and not new_misses:
+            return ""
+        return f" | aggregates: {new_hits} cached, {new_misses} computed ({self.aggregation_cache.summary()})"
+    
+    def histogram_bins(self):
+        return int(self.bins_var.get()) if hasattr(self, 'bins_var') else 10
+    
+    def chart_options(self):
+        """Collect the chart settings from the options panel"""
+        return {
+            'bins': self.histogram_bins(),
+            'correlation': hasattr(self, 'corr_var') and self.corr_var.get(),
+            'density': hasattr(self, 'density_var') and self.density_var.get(),
+            'value_column': self.value_column_var.get() if hasattr(self, 'value_column_var') else '',
+            'stat': self.density_stat_var.get() if hasattr(self, 'density_stat_var') else "count",
+            'log_scale': self.log_color_var.get() if hasattr(self, 'log_color_var') else True,
+            'cluster': hasattr(self, 'cluster_var') and self.cluster_var.get(),
+            'stream_path': self.file_path if self.streaming_from_file() else '',
+            'bin_range': self.bin_range(),
+        }
+    
+    def bin_range(self):
+        """Parse the streamed histogram range entry ('min:max'); blank means adaptive bins"""
+        text = self.bin_range_var.get().strip() if hasattr(self, 'bin_range_var') else ''
+        if not text:
+            return None
+        low, high = (float(part) for part in text.split(':'))
+        if not low < high:
+            raise ValueError("The histogram range needs min < max.")
+        return (low, high)
+    
+    def streaming_from_file(self):
+        """Whether the chart should be computed from the file on disk rather than the loaded data"""
+        if self.tail is not None or not self.file_path or not os.path.isfile(self.file_path):
+            return False
+        chart_type = self.chart_type_var.get()
+        correlation = chart_type == "Heatmap" and self.corr_var.get()
+        if correlation and self.file_columns:
+            # Only some columns of a columnar file are loaded; stream them all in chunks instead
+            return True
+        if not (hasattr(self, 'stream_var') and self.stream_var.get()):
+            return False
+        return chart_type in ("Histogram", "Boxplot") or correlation
+    
+    def chart_mode(self, chart_type, col1, col2):
+        """Describe the artists a chart is drawn with, or None if it can only be rebuilt"""
+        if self.streaming_from_file():
+            return None
+        if chart_type in ("Line", "Scatter"):
+            if chart_type == "Scatter" and (not col2 or (hasattr(self, 'density_var') and self.density_var.get())):
+                return None
+            x_series, y_series = xy_series(self.data, col1, col2)
+            decimated = len(self.data) > DECIMATE_THRESHOLD and is_plottable(x_series) and is_plottable(y_series)
+            if not decimated and not (pd.api.types.is_numeric_dtype(x_series) and
+                                      pd.api.types.is_numeric_dtype(y_series)):
+                return None
+            return (chart_type, bool(col2), decimated, pd.api.types.is_datetime64_any_dtype(x_series))
+        if chart_type == "Bar":
+            return (chart_type, bool(col2))
+        if chart_type == "Histogram":
+            return (chart_type, self.histogram_bins())
+        return None
+    
+    def chart_artists(self, chart_type, ax):
+        """Return the artists that update_chart_in_place rewrites for a chart"""
+        if chart_type == "Line":
+            return ax.get_lines()[:1]
+        if chart_type == "Scatter":
+            return ax.collections[:1]
+        if chart_type in ("Bar", "Histogram"):
+            return list(ax.patches)
+        return []
+    
+    def update_chart_in_place(self, chart_type, col1, col2):
+        """Point the current chart's artists at new columns; return False if it has to be rebuilt"""
+        state = self.chart_state
+        if state is None or state['type'] != chart_type or not state['artists']:
+            return False
+        mode = self.chart_mode(chart_type, col1, col2)
+        if mode is None or mode != state['mode']:
+            return False
+        
+        ax = state['ax']
+        artists = state['artists']
+        limits = (ax.get_xlim(), ax.get_ylim())
+        # Labels and titles are not animated, so only blit when none of them change
+        labels_changed = state['columns'] != (col1, col2)
+        
+        if chart_type in ("Line", "Scatter"):
+            x_series, y_series = xy_series(self.data, col1, col2)
+            x, y = plot_values(x_series), plot_values(y_series)
+            if mode[2]:
+                if not isinstance(self.view_updater, ZoomDecimator):
+                    return False
+                self.view_updater.set_pyramid(decimation_pyramid(chart_type, x_series, y_series,
+                                                                 [col1, col2], self.aggregate))
+            else:
+                if chart_type == "Line":
+                    artists[0].set_data(x, y)
+                else:
+                    artists[0].set_offsets(np.column_stack((x, y)))
+                ax.relim()
+                ax.set_autoscale_on(True)
+                ax.autoscale_view()
+            if chart_type == "Line" and col2 and ax.get_legend() is not None:
+                ax.get_legend().get_texts()[0].set_text(col2)
+            if col2:
+                ax.set_ylabel(col2)
+            
+        elif chart_type == "Bar":
+            values = bar_values(self.data, col1, col2, self.aggregate)
+            if len(values) != len(artists):
+                return False
+            for patch, height in zip(artists, values.to_numpy(dtype=float)):
+                patch.set_height(height)
+            tick_labels = [str(label) for label in values.index]
+            labels_changed |= tick_labels != [label.get_text() for label in ax.get_xticklabels()]
+            ax.set_xticklabels(tick_labels)
+            ax.set_ylabel(col2 if col2 else '')
+            ax.relim()
+            ax.set_autoscale_on(True)
+            ax.autoscale_view()
+            
+        elif chart_type == "Histogram":
+            counts, edges = histogram_counts(self.data, col1, self.histogram_bins(), self.aggregate)
+            if len(counts) != len(artists):
+                return False
+            for patch, left, right, height in zip(artists, edges[:-1], edges[1:], counts):
+                patch.set_x(left)
+                patch.set_width(right - left)
+                patch.set_height(height)
+            ax.relim()
+            ax.set_autoscale_on(True)
+            ax.autoscale_view()
+        
+        ax.set_xlabel(col1)
+        style_chart(ax, chart_type, col1)
+        state['columns'] = (col1, col2)
+        self.toolbar.update()
+        
+        if not labels_changed and (ax.get_xlim(), ax.get_ylim()) == limits:
+            self.blit_manager.update()
+        else:
+            self.canvas.draw_idle()
+        return True
+    
+    def ensure_surface(self):
+        """Create the figure, canvas and toolbar the first time a chart is drawn"""
+        if self.canvas is not None:
+            return
+        
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        
+        plt.style.use('default')
+        self.fig = Figure(figsize=(10, 6))
+        self.fig.patch.set_facecolor('#ffffff')
+        
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.scrollable_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self.scrollable_frame)
+        self.toolbar.update()
+        self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        self.blit_manager = BlitManager(self.canvas)
+    
+    def reset_figure(self):
+        """Remove the current chart from the figure, keeping the canvas and toolbar"""
+        if self.view_updater is not None:
+            self.view_updater.disconnect()
+            self.view_updater = None
+        
+        self.chart_state = None
+        if self.blit_manager is not None:
+            self.blit_manager.set_artists([])
+        if self.fig is not None:
+            self.fig.clf()
     
     def save_chart(self):
-        if self.fig is None:
+        if self.chart_state is None:
             messagebox.showwarning("No Chart", "Please generate a chart first.")
             return
 
@@ -449,31 +3415,854 @@ class DataVisualizer:
         )
         
         if file_path:
+            self.export_chart([(file_path, EXPORT_DPI)])
+    
+    def export_chart(self, targets):
+        """Write the current chart to each (file_path, dpi) target on a worker thread.
+        
+        The figure is pickled on the Tk thread and each export renders its own copy, so
+        the on-screen chart can keep changing while files are written.
+        """
+        timer = StageTimer('save', chart=self.chart_state['type'], files=[path for path, _ in targets])
+        try:
+            with timer.stage('snapshot'):
+                snapshot = figure_snapshot(self.fig)
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Failed to save chart:\n{str(e)}")
+            return
+        
+        def work(report, cancel_event):
+            for index, (file_path, dpi) in enumerate(targets, start=1):
+                if cancel_event.is_set():
+                    raise TaskCancelled()
+                report(f"Exporting {index}/{len(targets)}: {os.path.basename(file_path)} at {dpi} dpi")
+                with timer.stage('savefig'):
+                    export_figure(snapshot, file_path, dpi)
+            return targets
+        
+        def on_done(result):
+            if len(result) == 1:
+                self.status_var.set(f"Chart saved to {result[0][0]}")
+                messagebox.showinfo("Saved", f"Chart saved to:\n{result[0][0]}")
+            else:
+                self.status_var.set(f"Exported {len(result)} files to {os.path.dirname(result[0][0])}")
+            self.report_stages(timer)
+        
+        self.run_task("Saving chart", work, on_done)
+    
+    def export_charts(self):
+        """Ask for formats, resolutions and a base file name, then export the chart to all of them"""
+        if self.chart_state is None:
+            messagebox.showwarning("No Chart", "Please generate a chart first.")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Export Chart")
+        window.transient(self.root)
+        
+        frame = ttk.Frame(window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        col1, _ = self.chart_state['columns']
+        base_name = re.sub(r'[^\w.-]+', '_', f"{self.chart_state['type']}_{col1}")
+        
+        ttk.Label(frame, text="Folder:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
+        folder_var = tk.StringVar(value=os.path.dirname(self.file_path) if self.file_path else os.getcwd())
+        ttk.Entry(frame, textvariable=folder_var, width=40).grid(row=0, column=1, columnspan=3, sticky=tk.EW, padx=5)
+        ttk.Button(frame, text="Browse...",
+                   command=lambda: folder_var.set(filedialog.askdirectory(parent=window) or folder_var.get())
+                   ).grid(row=0, column=4, padx=5)
+        
+        ttk.Label(frame, text="File name:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
+        name_var = tk.StringVar(value=base_name)
+        ttk.Entry(frame, textvariable=name_var, width=40).grid(row=1, column=1, columnspan=3, sticky=tk.EW, padx=5)
+        
+        ttk.Label(frame, text="Formats:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
+        format_vars = {}
+        for column, fmt in enumerate(EXPORT_FORMATS, start=1):
+            format_vars[fmt] = tk.BooleanVar(value=fmt in ('png', 'pdf'))
+            ttk.Checkbutton(frame, text=fmt.upper(), variable=format_vars[fmt]).grid(row=2, column=column, sticky=tk.W)
+        
+        ttk.Label(frame, text="DPI (comma separated):").grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
+        dpi_var = tk.StringVar(value="150, 300")
+        ttk.Entry(frame, textvariable=dpi_var, width=20).grid(row=3, column=1, columnspan=2, sticky=tk.W, padx=5)
+        
+        def start():
+            formats = [fmt for fmt, var in format_vars.items() if var.get()]
             try:
-                self.fig.savefig(file_path, dpi=300, bbox_inches='tight', facecolor='white')
-                self.status_var.set(f"Chart saved to {file_path}")
-                messagebox.showinfo("Saved", f"Chart saved to:\n{file_path}")
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save chart:\n{str(e)}")
+                dpis = sorted({int(part) for part in dpi_var.get().split(',') if part.strip()})
+            except ValueError:
+                messagebox.showwarning("Export", "DPI values must be whole numbers.", parent=window)
+                return
+            if not formats or not dpis or not name_var.get().strip():
+                messagebox.showwarning("Export", "Choose a file name, at least one format and one DPI.",
+                                       parent=window)
+                return
+            base_path = os.path.join(folder_var.get(), name_var.get().strip())
+            window.destroy()
+            self.export_chart(export_targets(base_path, formats, dpis))
+        
+        btn_frame = ttk.Frame(frame)
+        btn_frame.grid(row=4, column=0, columnspan=5, sticky=tk.EW, pady=(10, 0))
+        ttk.Button(btn_frame, text="Export", command=start, style="Action.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+        window.grab_set()
     
     def clear_chart(self):
-        if hasattr(self, 'toolbar') and self.toolbar:
-            self.toolbar.destroy()
-            self.toolbar = None
+        self.reset_figure()
+        
+        if self.canvas is not None:
+            self.canvas.draw_idle()
+            self.toolbar.update()
             
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-            self.canvas = None
+        if self.pan_enabled:
+            self.toolbar.pan()
+        self.pan_enabled = False
+
+_worker_datasets = OrderedDict()
+
+def init_batch_worker():
+    """Prepare a batch worker process for headless rendering"""
+    plt.switch_backend('Agg')
+    plt.style.use('default')
+
+def load_dataset_once(file_path):
+    """Load a dataset in a batch worker, reusing it for later charts of the same file.
+
+    Returns the frame and the seconds spent loading it (0 when it was already loaded).
+    """
+    key = (os.path.abspath(file_path), os.path.getmtime(file_path))
+    if key in _worker_datasets:
+        _worker_datasets.move_to_end(key)
+        return _worker_datasets[key], 0.0
+    
+    started = time.perf_counter()
+    data = read_data_file(file_path)
+    _worker_datasets[key] = data
+    while len(_worker_datasets) > BATCH_CACHED_DATASETS:
+        _worker_datasets.popitem(last=False)
+    return data, time.perf_counter() - started
+
+def batch_output_name(index, spec, col1, col2):
+    stem = os.path.splitext(os.path.basename(spec['file']))[0]
+    parts = [f"{index:04d}", stem, spec.get('chart', "Bar"), col1] + ([col2] if col2 else [])
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', "_".join(str(part) for part in parts))
+    return f"{name}.{spec.get('format', 'png')}"
+
+def batch_result(index, spec, error=None):
+    return {'index': index, 'file': spec.get('file'), 'chart': spec.get('chart', "Bar"), 'output': None,
+            'ok': False, 'load_seconds': 0.0, 'render_seconds': 0.0, 'error': error}
+
+def render_chart_spec(index, spec, output_dir):
+    """Render one batch chart spec to a file and report its timings instead of raising.
+
+    Specs with "stream": true for a Histogram, Boxplot or correlation Heatmap read the
+    file in chunks and never load the whole dataset.
+    """
+    result = batch_result(index, spec)
+    started = time.perf_counter()
+    try:
+        chart_type = spec.get('chart', "Bar")
+        options = {key: spec[key] for key in CHART_OPTION_DEFAULTS if key in spec}
+        columns = None
+        if spec.get('stream'):
+            options['stream_path'] = spec['file']
+            correlation = chart_type == "Heatmap" and options.get('correlation', CHART_OPTION_DEFAULTS['correlation'])
+            if chart_type in ("Histogram", "Boxplot") or correlation:
+                columns = [spec['x']] if spec.get('x') else peek_columns(spec['file'])
+        if columns is not None:
+            data = pd.DataFrame(columns=columns)
+        else:
+            data, result['load_seconds'] = load_dataset_once(spec['file'])
+        render_started = time.perf_counter()
+        
+        col1 = spec.get('x') or data.columns[0]
+        col2 = spec.get('y') or ''
+        
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=tuple(spec.get('size', (10, 6))))
+        FigureCanvasAgg(fig)
+        fig.patch.set_facecolor('#ffffff')
+        ax = fig.add_subplot(111)
+        draw_chart(ax, data, chart_type, col1, col2, options)
+        style_chart(ax, chart_type, col1)
+        fig.tight_layout()
+        
+        output = os.path.join(output_dir, spec.get('output') or batch_output_name(index, spec, col1, col2))
+        fig.savefig(output, dpi=spec.get('dpi', 300), bbox_inches='tight', facecolor='white')
+        result.update(ok=True, output=output, render_seconds=time.perf_counter() - render_started)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['total_seconds'] = time.perf_counter() - started
+    return result
+
+def read_batch_specs(spec_path):
+    """Read chart specs from a JSON list (or {"charts": [...]}) with file paths relative to the spec file"""
+    with open(spec_path, 'r', encoding='utf-8') as handle:
+        specs = json.load(handle)
+    if isinstance(specs, dict):
+        specs = specs.get('charts', [])
+    
+    base_dir = os.path.dirname(os.path.abspath(spec_path))
+    for spec in specs:
+        if 'file' in spec and not os.path.isabs(spec['file']):
+            spec['file'] = os.path.join(base_dir, spec['file'])
+    return specs
+
+def run_batch(spec_path, output_dir, workers=None):
+    """Render every chart in a spec file across a process pool; return the number of failures"""
+    specs = read_batch_specs(spec_path)
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    
+    order = sorted(range(len(specs)), key=lambda index: str(specs[index].get('file', '')))
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker) as pool:
+        futures = {pool.submit(render_chart_spec, index, specs[index], output_dir): index for index in order}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                # A worker died (out of memory, say) and took the pool down; its charts and
+                # any not yet rendered fail instead of aborting the batch
+                index = futures[future]
+                result = batch_result(index, specs[index], f"worker process died: {e}")
+            results.append(result)
+            if result['ok']:
+                print(f"[ok]   #{result['index']:04d} {result['chart']:<9} {result['output']} "
+                      f"(load {result['load_seconds']:.2f}s, render {result['render_seconds']:.2f}s)")
+            else:
+                print(f"[fail] #{result['index']:04d} {result['chart']:<9} {result['file']}: {result['error']}")
+    
+    failures = sum(1 for result in results if not result['ok'])
+    print(f"Rendered {len(results) - failures}/{len(results)} charts in {time.perf_counter() - started:.1f}s "
+          f"({failures} failed)")
+    return failures
+
+def json_values(values):
+    """Plain list of a column or array with missing and non-finite values as None and dates as ISO strings"""
+    if isinstance(values, np.ndarray) and values.ndim > 1:
+        return [json_values(row) for row in values]
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return [None if pd.isna(value) else value.isoformat() for value in series]
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        array = series.to_numpy(dtype=float, na_value=np.nan)
+        result = array.astype(object)
+        result[~np.isfinite(array)] = None
+        return result.tolist()
+    return [json_ready(value) for value in series.astype(object).where(series.notna(), None)]
+
+def json_ready(value):
+    """Convert numpy and pandas values inside dicts and lists into types json.dumps accepts"""
+    if isinstance(value, dict):
+        return {str(key): json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_ready(item) for item in value]
+    if isinstance(value, (np.ndarray, pd.Series, pd.Index)):
+        return json_values(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return value
+
+def date_numbers_to_iso(values):
+    return [value.replace(tzinfo=None).isoformat() for value in mdates.num2date(values)]
+
+def axis_values(values, is_date):
+    return date_numbers_to_iso(values) if is_date else json_values(values)
+
+def parse_bound(value, is_date):
+    """A zoom limit sent by the browser: a number, or a date string on date axes"""
+    if value in (None, ''):
+        return None
+    if is_date:
+        return float(mdates.date2num(pd.Timestamp(value).to_datetime64()))
+    return float(value)
+
+def top_categories(values):
+    """Keep the first SERVE_MAX_CATEGORIES entries of a per-category series"""
+    return {'x': values.index[:SERVE_MAX_CATEGORIES], 'y': values.iloc[:SERVE_MAX_CATEGORIES],
+            'categories': len(values)}
+
+def view_limits(view, key, extent, is_date):
+    low = parse_bound(view.get(f'{key}min'), is_date)
+    high = parse_bound(view.get(f'{key}max'), is_date)
+    return (extent[0] if low is None else low, extent[1] if high is None else high)
+
+def view_cells(view):
+    """Grid size for a view, one cell per SERVE_CELL_PIXELS square of screen pixels"""
+    return max(view['width'] // SERVE_CELL_PIXELS, 1), max(view['height'] // SERVE_CELL_PIXELS, 1)
+
+def line_series(data, col1, col2, view, aggregate):
+    """Every point of a small Line chart, or a min/max decimation of the requested x range"""
+    x_series, y_series = xy_series(data, col1, col2)
+    is_date = pd.api.types.is_datetime64_any_dtype(x_series)
+    if len(data) <= DECIMATE_THRESHOLD:
+        return {'x': x_series, 'y': y_series, 'x_type': 'date' if is_date else 'auto', 'decimated': False}
+    
+    pyramid = decimation_pyramid("Line", x_series, y_series, [col1, col2], aggregate)
+    if pyramid is None:
+        raise ChartError("Data Error", "Line charts of this size need numeric or date columns.")
+    (x0, x1), _ = pyramid.extent()
+    xmin, xmax = view_limits(view, 'x', (x0, x1), is_date)
+    x, y = pyramid.view(xmin, xmax, view['width'])
+    return {'x': axis_values(x, is_date), 'y': y, 'x_type': 'date' if is_date else 'linear', 'decimated': True}
+
+def scatter_series(data, col1, col2, view, aggregate):
+    """Every point of a small Scatter chart, or at most one point per grid cell of the requested view"""
+    if len(data) <= DECIMATE_THRESHOLD:
+        return {'x': data[col1], 'y': data[col2], 'decimated': False}
+    
+    x_date = pd.api.types.is_datetime64_any_dtype(data[col1])
+    y_date = pd.api.types.is_datetime64_any_dtype(data[col2])
+    
+    pyramid = decimation_pyramid("Scatter", data[col1], data[col2], [col1, col2], aggregate)
+    if pyramid is None:
+        raise ChartError("Data Error", "Scatter charts of this size need numeric or date columns.")
+    x_extent, y_extent = pyramid.extent()
+    xlim = view_limits(view, 'x', x_extent, x_date)
+    ylim = view_limits(view, 'y', y_extent, y_date)
+    width, height = view_cells(view)
+    x, y = pyramid.view(xlim, ylim, width, height)
+    return {'x': axis_values(x, x_date), 'y': axis_values(y, y_date), 'decimated': True}
+
+def density_series(data, col1, col2, options, view, aggregate):
+    """Binned count, sum or mean grid of two columns over the requested view"""
+    value_column, stat = options['value_column'], options['stat']
+    if stat != "count" and not value_column:
+        raise ChartError("Selection Error", f"The '{stat}' statistic needs a value column.")
+    
+    x, y = plot_values(data[col1]), plot_values(data[col2])
+    if x is None or y is None:
+        raise ChartError("Data Error", "Density charts need numeric or date columns.")
+    values = plot_values(data[value_column]) if stat != "count" else None
+    if stat != "count" and values is None:
+        raise ChartError("Data Error", f"Column '{value_column}' is not numeric.")
+    
+    x_date = pd.api.types.is_datetime64_any_dtype(data[col1])
+    y_date = pd.api.types.is_datetime64_any_dtype(data[col2])
+    x_extent = aggregate('extent', [col1], lambda: (np.nanmin(x), np.nanmax(x)))
+    y_extent = aggregate('extent', [col2], lambda: (np.nanmin(y), np.nanmax(y)))
+    xlim = view_limits(view, 'x', x_extent, x_date)
+    ylim = view_limits(view, 'y', y_extent, y_date)
+    width, height = view_cells(view)
+    grid = bin_2d(x, y, xlim, ylim, width, height, values, stat)
+    
+    log_scale = options['log_scale'] and stat == "count"
+    if log_scale:
+        with np.errstate(divide='ignore'):
+            grid = np.where(grid > 0, np.log10(grid), np.nan)
+    x_centers = xlim[0] + (np.arange(width) + 0.5) * (xlim[1] - xlim[0]) / width
+    y_centers = ylim[0] + (np.arange(height) + 0.5) * (ylim[1] - ylim[0]) / height
+    return {'z': grid, 'x': axis_values(x_centers, x_date), 'y': axis_values(y_centers, y_date),
+            'stat': stat, 'log_scale': log_scale}
+
+def chart_series(data, chart_type, col1, col2='', options=None, aggregate=compute_directly, view=None):
+    """The aggregated, binned or decimated series a chart needs, for the aggregation server.
+
+    This is the data half of draw_chart: instead of drawing, it returns the values a
+    browser has to plot, so the payload stays small however many rows are loaded.
+    view holds the chart 'width' and 'height' in pixels and optional xmin/xmax/ymin/ymax
+    limits of a zoomed Line, Scatter or density chart. Raises ChartError like draw_chart.
+    """
+    options = {**CHART_OPTION_DEFAULTS, **(options or {})}
+    view = {'width': SERVE_VIEW_SIZE[0], 'height': SERVE_VIEW_SIZE[1], **(view or {})}
+    for column in (col1, col2, options['value_column']):
+        if column and column not in data.columns:
+            raise ChartError("Selection Error", f"Unknown column '{column}'.")
+    
+    if chart_type in ("Bar", "Pie"):
+        if chart_type == "Pie":
+            result = top_categories(value_counts(data, col1, aggregate))
+        else:
+            result = top_categories(bar_values(data, col1, col2, aggregate))
+    
+    elif chart_type == "Line":
+        result = line_series(data, col1, col2, view, aggregate)
+    
+    elif chart_type == "Scatter":
+        if not col2:
+            raise ChartError("Selection Error", "Scatter plot requires two columns.")
+        if options['density']:
+            result = {'density': True, **density_series(data, col1, col2, options, view, aggregate)}
+        else:
+            result = scatter_series(data, col1, col2, view, aggregate)
+    
+    elif chart_type == "Histogram":
+        counts, edges = histogram_counts(data, col1, options['bins'], aggregate)
+        result = {'counts': counts, 'edges': edges}
+    
+    elif chart_type == "Boxplot":
+        stats = aggregate('box_stats', [col1], lambda: frame_box_stats(data[col1], col1))
+        result = {key: stats[key] for key in ('q1', 'med', 'q3', 'whislo', 'whishi', 'fliers')}
+    
+    elif chart_type == "Heatmap":
+        if options['correlation']:
+            corr = correlation_matrix(data, aggregate)
+            if corr.empty:
+                raise ChartError("Data Error", "No numeric columns for correlation heatmap.")
+            if options['cluster']:
+                order = cluster_order(corr)
+                corr = corr.iloc[order, order]
+            result = {'correlation': True, 'z': corr.to_numpy(), 'x': corr.columns, 'y': corr.index}
+        else:
+            if not col2:
+                raise ChartError("Selection Error", "Heatmap requires X and Y columns.")
+            result = {'density': True, **density_series(data, col1, col2, options, view, aggregate)}
+    
+    else:
+        raise ChartError("Selection Error", f"Unknown chart type '{chart_type}'.")
+    
+    return {'chart': chart_type, 'x_column': col1, 'y_column': col2, 'rows': len(data), **result}
+
+def column_kind(series):
+    if pd.api.types.is_bool_dtype(series):
+        return 'bool'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'date'
+    if pd.api.types.is_numeric_dtype(series):
+        return 'number'
+    return 'text'
+
+def preview_rows(data, offset=0, limit=10):
+    """Rows offset..offset+limit of a frame as lists of JSON-ready values"""
+    window = data.iloc[offset:offset + limit]
+    columns = [json_values(window[col]) for col in window.columns]
+    return [list(row) for row in zip(*columns)]
+
+class ApiError(Exception):
+    """A request the aggregation server rejects with an HTTP status"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ServedDataset:
+    """A dataset held by the aggregation server"""
+    
+    def __init__(self, dataset_id, name, data, path, owned, load_seconds):
+        self.id = dataset_id
+        self.name = name
+        self.data = data
+        self.path = path
+        self.owned = owned
+        self.load_seconds = load_seconds
+    
+    def info(self, preview=0):
+        data = self.data
+        memory = data.memory_usage(deep=True, index=False)
+        info = {'id': self.id, 'name': self.name, 'rows': len(data), 'load_seconds': self.load_seconds,
+                'memory_bytes': int(memory.sum()),
+                'columns': [{'name': str(col), 'dtype': str(data[col].dtype), 'kind': column_kind(data[col]),
+                             'bytes': int(memory[col])} for col in data.columns]}
+        if preview:
+            info['preview'] = preview_rows(data, 0, preview)
+        return info
+
+class AggregationServer(ThreadingHTTPServer):
+    """HTTP server holding parsed datasets and answering chart requests with aggregated series.
+
+    Datasets are keyed by a hash of their contents (uploads) or of their path, size and
+    mtime (files under data_root), so sending the same file again reuses the parsed frame.
+    Aggregations are memoized in an AggregationCache shared by all request threads, and
+    finished JSON responses are cached as well and served with an ETag.
+    
+    The front-end is served from the same origin, so no CORS headers are sent unless
+    allow_origin names an origin that may call the API from elsewhere.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, address, data_root=None, allow_origin=None, upload_dir=UPLOAD_DIR):
+        super().__init__(address, AggregationRequestHandler)
+        self.data_root = os.path.realpath(data_root) if data_root else None
+        self.allow_origin = allow_origin
+        self.upload_dir = upload_dir
+        self.static_dir = os.path.dirname(os.path.abspath(__file__))
+        self.datasets = OrderedDict()
+        self.lock = threading.Lock()
+        self.load_cache = LoadCache()
+        self.aggregations = AggregationCache()
+        self.responses = AggregationCache(SERVE_RESPONSE_CACHE_BYTES)
+    
+    def dataset(self, dataset_id):
+        with self.lock:
+            dataset = self.datasets.get(dataset_id)
+            if dataset is None:
+                raise ApiError(404, f"No dataset '{dataset_id}'; upload it again.")
+            self.datasets.move_to_end(dataset_id)
+            return dataset
+    
+    def find(self, dataset_id):
+        with self.lock:
+            return self.datasets.get(dataset_id)
+    
+    def add(self, dataset):
+        with self.lock:
+            self.datasets[dataset.id] = dataset
+            evicted = []
+            while len(self.datasets) > SERVE_MAX_DATASETS:
+                evicted.append(self.datasets.popitem(last=False)[1])
+        for old in evicted:
+            self.discard(old)
+    
+    def remove(self, dataset_id):
+        with self.lock:
+            dataset = self.datasets.pop(dataset_id, None)
+        if dataset is None:
+            raise ApiError(404, f"No dataset '{dataset_id}'.")
+        self.discard(dataset)
+    
+    def discard(self, dataset):
+        if dataset.owned:
+            try:
+                os.remove(dataset.path)
+            except OSError:
+                pass
+    
+    def aggregate_for(self, dataset):
+        """aggregate() callable for chart_series that memoizes per dataset"""
+        def aggregate(op, columns, compute, *params):
+            return self.aggregations.get((dataset.id, op, tuple(columns), params), compute)
+        return aggregate
+    
+    def load(self, dataset_id, name, path, owned, columns=None, compact=False):
+        """Parse a file into a ServedDataset, going through the load cache like the desktop app"""
+        started = time.perf_counter()
+        options = csv_options(path)
+        if columns:
+            options['usecols'] = columns
+        if compact:
+            options['compact'] = True
+        use_cache = not is_columnar(path)
+        data = self.load_cache.get(path, options) if use_cache else None
+        if data is None:
+            data = read_data_file(path, usecols=columns, compact=compact)
+            if use_cache:
+                try:
+                    self.load_cache.put(path, options, data)
+                except Exception:
+                    print(traceback.format_exc())
+        dataset = ServedDataset(dataset_id, name, data, path, owned, time.perf_counter() - started)
+        self.add(dataset)
+        return dataset
+    
+    def resolve_path(self, path):
+        """Absolute path of a file the client asked to load, which must lie under data_root"""
+        if self.data_root is None:
+            raise ApiError(403, "Loading files by path is disabled; start the server with --data-root.")
+        full_path = os.path.realpath(os.path.join(self.data_root, path))
+        if os.path.commonpath([full_path, self.data_root]) != self.data_root:
+            raise ApiError(403, "Path is outside the data root.")
+        if not os.path.isfile(full_path):
+            raise ApiError(404, f"No file '{path}'.")
+        if not full_path.lower().endswith(DATA_EXTENSIONS):
+            raise ApiError(415, "File format not supported.")
+        return full_path
+
+class AggregationRequestHandler(BaseHTTPRequestHandler):
+    """JSON API of the aggregation server.
+
+        GET    /api/health
+        GET    /api/datasets                      datasets currently held
+        POST   /api/datasets?name=FILE[&compact=0] upload a file as the request body
+        POST   /api/datasets                      {"path": ..., "columns": [...], "compact": false}
+        GET    /api/datasets/ID                   rows and columns (name, dtype, kind, bytes)
+        GET    /api/datasets/ID/preview?offset=&limit=
+        GET    /api/datasets/ID/chart?type=&x=&y=&bins=&width=&height=&xmin=&xmax=&ymin=&ymax=
+        DELETE /api/datasets/ID
+    
+    Datasets are loaded with compact dtypes unless compact is turned off, which also
+    parses date columns. Without a path under /api the handler serves the browser
+    front-end files.
+    """
+    
+    server_version = "DataVisualizer"
+    protocol_version = "HTTP/1.1"
+    
+    ROUTES = [
+        ('GET', re.compile(r'/api/health'), 'health'),
+        ('GET', re.compile(r'/api/datasets'), 'list_datasets'),
+        ('POST', re.compile(r'/api/datasets'), 'create_dataset'),
+        ('GET', re.compile(r'/api/datasets/(\w+)'), 'dataset_info'),
+        ('DELETE', re.compile(r'/api/datasets/(\w+)'), 'delete_dataset'),
+        ('GET', re.compile(r'/api/datasets/(\w+)/preview'), 'dataset_preview'),
+        ('GET', re.compile(r'/api/datasets/(\w+)/chart'), 'dataset_chart'),
+    ]
+    CACHED_ROUTES = ('dataset_info', 'dataset_preview', 'dataset_chart')
+    
+    def do_OPTIONS(self):
+        self.send_response(204)
+        if self.send_cors_headers():
+            self.send_header('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+            self.send_header('Access-Control-Max-Age', '86400')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def do_GET(self):
+        self.dispatch('GET')
+    
+    def do_POST(self):
+        self.dispatch('POST')
+    
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+    
+    def dispatch(self, method):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method == 'GET' and url.path in STATIC_FILES:
+            return self.send_static(STATIC_FILES[url.path])
+        
+        started = time.perf_counter()
+        try:
+            for route_method, pattern, name in self.ROUTES:
+                match = pattern.fullmatch(url.path)
+                if match and route_method == method:
+                    break
+            else:
+                raise ApiError(404, f"No route for {method} {url.path}")
             
-        if self.fig:
-            plt.close(self.fig)
-            self.fig = None
+            if name in self.CACHED_ROUTES:
+                self.server.dataset(match.group(1))
+                computed = []
+                
+                def compute():
+                    computed.append(True)
+                    return self.encode(getattr(self, name)(*match.groups(), query))
+                
+                key = (url.path, tuple(sorted(query.items())))
+                body = self.server.responses.get(key, compute)
+                return self.send_body(body, started, cached=not computed)
             
-        self.pan_enabled = False
+            self.send_body(self.encode(getattr(self, name)(*match.groups(), query)), started, cache=False)
+        except ApiError as e:
+            self.send_error_json(e.status, str(e))
+        except ChartError as e:
+            self.send_error_json(400, str(e), e.title)
+        except (KeyError, ValueError) as e:
+            self.send_error_json(400, f"{type(e).__name__}: {e}")
+        except Exception as e:
+            print(traceback.format_exc())
+            self.send_error_json(500, f"{type(e).__name__}: {e}")
+    
+    def encode(self, payload):
+        return json.dumps(json_ready(payload), separators=(',', ':'), default=str).encode('utf-8')
+    
+    def send_cors_headers(self):
+        """Allow the configured cross-origin caller, if any; return whether headers were sent"""
+        if not self.server.allow_origin:
+            return False
+        self.send_header('Access-Control-Allow-Origin', self.server.allow_origin)
+        self.send_header('Access-Control-Expose-Headers', 'ETag, Server-Timing')
+        self.send_header('Vary', 'Origin')
+        return True
+    
+    def send_body(self, body, started, cached=False, cache=True):
+        """Send a JSON body, or 304 when the client already holds it; cache=False marks changing data"""
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        not_modified = cache and self.headers.get('If-None-Match') == etag
+        self.send_response(304 if not_modified else 200)
+        self.send_cors_headers()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Cache-Control', 'private, max-age=3600' if cache else 'no-store')
+        if cache:
+            self.send_header('ETag', etag)
+        elapsed_ms = 1000 * (time.perf_counter() - started)
+        self.send_header('Server-Timing', f"{'cache' if cached else 'compute'};dur={elapsed_ms:.1f}")
+        self.send_header('Content-Length', '0' if not_modified else str(len(body)))
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(body)
+    
+    def send_error_json(self, status, message, title="Error"):
+        body = self.encode({'error': message, 'title': title})
+        self.send_response(status)
+        self.send_cors_headers()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_static(self, name):
+        try:
+            with open(os.path.join(self.server.static_dir, name), 'rb') as handle:
+                body = handle.read()
+        except OSError:
+            return self.send_error_json(404, f"No file '{name}'.")
+        content_type = {'.html': 'text/html', '.js': 'text/javascript', '.css': 'text/css'}[os.path.splitext(name)[1]]
+        self.send_response(200)
+        self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def read_body_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON.")
+    
+    def health(self, query):
+        return {'ok': True, 'datasets': len(self.server.datasets), 'formats': list(DATA_EXTENSIONS),
+                'aggregations': self.server.aggregations.summary()}
+    
+    def list_datasets(self, query):
+        with self.server.lock:
+            datasets = list(self.server.datasets.values())
+        return {'datasets': [{'id': dataset.id, 'name': dataset.name, 'rows': len(dataset.data)}
+                             for dataset in datasets]}
+    
+    def create_dataset(self, query):
+        """Upload the request body as the file named in the query, or load {"path": ...} from under the data root"""
+        compact = query.get('compact', '1') in ('1', 'true')
+        if 'name' not in query:
+            request = self.read_body_json()
+            path = self.server.resolve_path(str(request.get('path', '')))
+            columns = request.get('columns') or None
+            compact = bool(request.get('compact', compact))
+            stat = os.stat(path)
+            fingerprint = [path, stat.st_size, stat.st_mtime_ns, columns, compact]
+            dataset_id = hashlib.sha1(json.dumps(fingerprint).encode()).hexdigest()[:20]
+            dataset = self.server.find(dataset_id)
+            if dataset is None:
+                dataset = self.server.load(dataset_id, os.path.basename(path), path, False, columns, compact)
+            return dataset.info(preview=10)
+        
+        name = os.path.basename(query.get('name', ''))
+        extension = os.path.splitext(name)[1].lower()
+        if extension not in DATA_EXTENSIONS:
+            raise ApiError(415, "File format not supported.")
+        dataset_id, upload_path = self.receive_upload(extension, compact)
+        dataset = self.server.find(dataset_id)
+        if dataset is not None:
+            os.remove(upload_path)
+            return dataset.info(preview=10)
+        
+        path = os.path.join(self.server.upload_dir, f"{dataset_id}{extension}")
+        os.replace(upload_path, path)
+        try:
+            dataset = self.server.load(dataset_id, name, path, True, compact=compact)
+        except Exception:
+            os.remove(path)
+            raise
+        return dataset.info(preview=10)
+    
+    def receive_upload(self, extension, compact):
+        """Stream the request body to a temporary file; return (content hash id, temporary path)"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            raise ApiError(411, "Send the file as the request body with a Content-Length.")
+        if length > SERVE_MAX_UPLOAD_BYTES:
+            self.close_connection = True
+            raise ApiError(413, f"Uploads are limited to {SERVE_MAX_UPLOAD_BYTES / 1e9:,.1f} GB.")
+        
+        os.makedirs(self.server.upload_dir, exist_ok=True)
+        digest = hashlib.sha1(f"{extension}:{compact}:".encode())
+        with tempfile.NamedTemporaryFile(dir=self.server.upload_dir, suffix=extension, delete=False) as handle:
+            remaining = length
+            while remaining > 0:
+                chunk = self.rfile.read(min(remaining, 1024 ** 2))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                handle.write(chunk)
+                remaining -= len(chunk)
+        if remaining > 0:
+            os.remove(handle.name)
+            self.close_connection = True
+            raise ApiError(400, "The upload ended early.")
+        return digest.hexdigest()[:20], handle.name
+    
+    def dataset_info(self, dataset_id, query):
+        return self.server.dataset(dataset_id).info()
+    
+    def delete_dataset(self, dataset_id, query):
+        self.server.remove(dataset_id)
+        return {'deleted': dataset_id}
+    
+    def dataset_preview(self, dataset_id, query):
+        data = self.server.dataset(dataset_id).data
+        offset = max(int(query.get('offset', 0)), 0)
+        limit = min(max(int(query.get('limit', 10)), 0), SERVE_PREVIEW_ROWS)
+        return {'columns': list(data.columns), 'offset': offset, 'total': len(data),
+                'rows': preview_rows(data, offset, limit)}
+    
+    def dataset_chart(self, dataset_id, query):
+        dataset = self.server.dataset(dataset_id)
+        options = {
+            'bins': min(max(int(query.get('bins', CHART_OPTION_DEFAULTS['bins'])), 1), 10_000),
+            'correlation': query.get('correlation', '1') in ('1', 'true'),
+            'cluster': query.get('cluster') in ('1', 'true'),
+            'density': query.get('density') in ('1', 'true'),
+            'log_scale': query.get('log_scale', '1') in ('1', 'true'),
+            'value_column': query.get('value', ''),
+            'stat': query.get('stat', "count"),
+        }
+        if options['stat'] not in DENSITY_STATS:
+            raise ApiError(400, f"stat must be one of {', '.join(DENSITY_STATS)}.")
+        view = {key: query[key] for key in ('xmin', 'xmax', 'ymin', 'ymax') if key in query}
+        for key, default in zip(('width', 'height'), SERVE_VIEW_SIZE):
+            view[key] = min(max(int(query.get(key, default)), 50), 4000)
+        
+        started = time.perf_counter()
+        result = chart_series(dataset.data, query.get('type', "Bar"), query.get('x', ''), query.get('y', ''),
+                              options, self.server.aggregate_for(dataset), view)
+        result['seconds'] = time.perf_counter() - started
+        return result
 
-def main():
+def run_server(host=SERVE_HOST, port=SERVE_PORT, data_root=None, allow_origin=None):
+    """Serve the aggregation API and the browser front-end until interrupted"""
+    server = AggregationServer((host, port), data_root, allow_origin)
+    print(f"Serving the Data Visualizer on http://{host}:{server.server_port}/ (Ctrl+C to stop)")
+    if data_root:
+        print(f"Files under {server.data_root} can be loaded by path")
+    if allow_origin:
+        print(f"Cross-origin requests are allowed from {allow_origin}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Advanced Data Visualizer")
+    parser.add_argument("--batch", metavar="SPECS",
+                        help="render the charts listed in a JSON spec file without opening a window")
+    parser.add_argument("--output-dir", default="charts", help="directory for batch chart files")
+    parser.add_argument("--workers", type=int, default=None, help="batch worker processes (default: CPU count)")
+    parser.add_argument("--trace", metavar="PATH", default=os.environ.get(TRACE_ENV_VAR),
+                        help=f"append per-stage timings and peak memory as JSON lines (or set {TRACE_ENV_VAR})")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print how long the window and the background imports take, then exit")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the aggregation server for the browser front-end instead of the window")
+    parser.add_argument("--host", default=SERVE_HOST, help="address the aggregation server listens on")
+    parser.add_argument("--port", type=int, default=SERVE_PORT, help="port the aggregation server listens on")
+    parser.add_argument("--data-root", help="let clients load files under this directory by path")
+    parser.add_argument("--allow-origin",
+                        help="CORS origin allowed to call the server from another page "
+                             "(use 'null' for index.html opened from disk); none by default")
+    args = parser.parse_args(argv)
+    
+    if args.batch:
+        sys.exit(1 if run_batch(args.batch, args.output_dir, args.workers) else 0)
+    
+    if args.serve:
+        run_server(args.host, args.port, args.data_root, args.allow_origin)
+        return
+    
     root = tk.Tk()
-    app = DataVisualizer(root)
+    app = DataVisualizer(root, measure_startup=args.startup_time, trace_path=args.trace)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,7 +1,63 @@
+const DEFAULT_SERVER_URL = 'http://127.0.0.1:8765';
+const CHART_COLORS = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#34495e'];
+
 let currentData = null;
 let currentChart = null;
 let isFullscreen = false;
 let currentFileName = '';
+let serverUrl = null;
+let serverDataset = null;
+let chartRequest = 0;
+
+// The aggregation server (python data_vis.py --serve) holds the data and sends back
+// only the series each chart needs. Without it, files are parsed in the browser.
+// The server sends no CORS headers by default, so it is used from the page it serves.
+// To use it from index.html opened from disk, start it with --allow-origin null.
+async function detectServer() {
+    const candidates = [window.DATA_VIS_SERVER];
+    if (location.protocol.startsWith('http')) {
+        candidates.push(location.origin);
+    } else {
+        candidates.push(DEFAULT_SERVER_URL);
+    }
+
+    for (const url of new Set(candidates.filter(Boolean))) {
+        try {
+            const response = await fetch(`${url}/api/health`, { signal: AbortSignal.timeout(1500) });
+            const health = response.ok ? await response.json() : null;
+            if (health && health.ok) {
+                serverUrl = url;
+                document.getElementById('fileInput').accept = health.formats.join(',');
+                setStatus(`Connected to the aggregation server at ${url}`);
+                return;
+            }
+        } catch (error) {
+            // Not running at this address
+        }
+    }
+}
+
+async function serverRequest(path, options = {}) {
+    const response = await fetch(serverUrl + path, options);
+    const body = await response.json();
+    if (!response.ok) {
+        throw new Error(body.error || `Server returned ${response.status}`);
+    }
+    return body;
+}
+
+function hasData() {
+    return serverDataset !== null || (currentData !== null && currentData.length > 0);
+}
+
+function getColumns() {
+    if (serverDataset) return serverDataset.columns.map(col => col.name);
+    return currentData && currentData.length > 0 ? Object.keys(currentData[0]) : [];
+}
+
+function getRowCount() {
+    return serverDataset ? serverDataset.rows : currentData.length;
+}
 
 function loadFile() {
     const fileInput = document.getElementById('fileInput');
@@ -12,6 +68,36 @@ function loadFile() {
 
     const file = fileInput.files[0];
     currentFileName = file.name;
+
+    if (serverUrl) {
+        loadFileOnServer(file).catch(error => {
+            console.error(error);
+            setStatus(`Server could not load ${file.name} (${error.message}); parsing it in the browser`);
+            parseFile(file);
+        });
+    } else {
+        parseFile(file);
+    }
+}
+
+async function loadFileOnServer(file) {
+    setStatus(`Uploading ${file.name} to the aggregation server...`);
+    const dataset = await serverRequest(`/api/datasets?name=${encodeURIComponent(file.name)}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/octet-stream' },
+        body: file
+    });
+
+    serverDataset = dataset;
+    currentData = null;
+    updateColumnSelects();
+    updatePreview();
+    updateFileInfo();
+    setStatus(`Loaded ${file.name} on the server: ${dataset.rows.toLocaleString()} rows ` +
+              `in ${dataset.load_seconds.toFixed(1)}s (${(dataset.memory_bytes / 1e6).toFixed(1)} MB)`);
+}
+
+function parseFile(file) {
     const reader = new FileReader();
 
     reader.onload = function(e) {
@@ -61,6 +147,7 @@ function loadFile() {
             }
 
             currentData = data;
+            serverDataset = null;
             updateColumnSelects();
             updatePreview();
             updateFileInfo();
@@ -80,9 +167,9 @@ function loadFile() {
 }
 
 function updateColumnSelects() {
-    if (!currentData || currentData.length === 0) return;
+    if (!hasData()) return;
 
-    const columns = Object.keys(currentData[0]);
+    const columns = getColumns();
     const xSelect = document.getElementById('xColumn');
     const ySelect = document.getElementById('yColumn');
 
@@ -111,23 +198,26 @@ function updateColumnSelects() {
 
 function updatePreview() {
     const previewArea = document.getElementById('previewArea');
-    if (!currentData) {
+    if (!hasData()) {
         previewArea.textContent = 'No data loaded';
         return;
     }
 
-    let preview = `Data Preview (${currentData.length} rows, ${Object.keys(currentData[0]).length} columns)\n\n`;
-    preview += `Columns: ${Object.keys(currentData[0]).join(', ')}\n\n`;
+    const headers = getColumns();
+    const rows = serverDataset
+        ? serverDataset.preview.slice(0, 5)
+        : currentData.slice(0, 5).map(row => headers.map(h => row[h]));
+
+    let preview = `Data Preview (${getRowCount()} rows, ${headers.length} columns)\n\n`;
+    preview += `Columns: ${headers.join(', ')}\n\n`;
     preview += 'First 5 rows:\n\n';
 
-    const headers = Object.keys(currentData[0]);
     preview += headers.join('\t') + '\n';
     preview += '-'.repeat(headers.join('\t').length) + '\n';
     
-    for (let i = 0; i < Math.min(5, currentData.length); i++) {
-        const row = currentData[i];
-        preview += headers.map(h => row[h] !== undefined ? row[h] : '').join('\t') + '\n';
-    }
+    rows.forEach(row => {
+        preview += row.map(value => value !== undefined && value !== null ? value : '').join('\t') + '\n';
+    });
 
     previewArea.textContent = preview;
 }
@@ -138,11 +228,11 @@ function updateFileInfo() {
     const rowCount = document.getElementById('rowCount');
     const colCount = document.getElementById('colCount');
     
-    if (currentData && currentData.length > 0) {
+    if (hasData()) {
         fileInfo.classList.remove('hidden');
         fileName.textContent = currentFileName;
-        rowCount.textContent = currentData.length;
-        colCount.textContent = Object.keys(currentData[0]).length;
+        rowCount.textContent = getRowCount();
+        colCount.textContent = getColumns().length;
     } else {
         fileInfo.classList.add('hidden');
     }
@@ -175,7 +265,7 @@ function onChartTypeChange() {
 }
 
 function plotChart() {
-    if (!currentData) {
+    if (!hasData()) {
         alert('Please load data first');
         return;
     }
@@ -189,6 +279,11 @@ function plotChart() {
         return;
     }
 
+    if (serverDataset) {
+        plotServerChart(chartType, xCol, yCol);
+        return;
+    }
+
     try {
         let trace;
         const layout = {
@@ -347,6 +442,169 @@ function plotChart() {
     }
 }
 
+function chartLayout(chartType, xCol) {
+    return {
+        title: `${chartType} Chart of ${xCol}`,
+        font: { family: 'Segoe UI', size: 14, color: '#2c3e50' },
+        plot_bgcolor: '#f8f9fa',
+        paper_bgcolor: '#ffffff',
+        margin: { t: 60, r: 40, b: 80, l: 60 }
+    };
+}
+
+function chartQuery(chartType, xCol, yCol, range) {
+    const chartElement = document.getElementById('chart');
+    const binsInput = document.getElementById('binsInput');
+    const corrCheckbox = document.getElementById('corrCheckbox');
+    const params = new URLSearchParams({
+        type: chartType,
+        x: xCol,
+        y: yCol || '',
+        width: Math.max(chartElement.clientWidth, 400),
+        height: Math.max(chartElement.clientHeight, 300)
+    });
+    if (chartType === 'Histogram' && binsInput) params.set('bins', binsInput.value);
+    if (chartType === 'Heatmap' && corrCheckbox) params.set('correlation', corrCheckbox.checked ? '1' : '0');
+    Object.entries(range || {}).forEach(([key, value]) => params.set(key, value));
+    return `/api/datasets/${serverDataset.id}/chart?${params}`;
+}
+
+// Plotly traces for the aggregated series the server returns for each chart type
+function serverTraces(chartType, series, xCol) {
+    if (series.density) {
+        return [{
+            z: series.z, x: series.x, y: series.y,
+            type: 'heatmap',
+            colorscale: 'Viridis',
+            colorbar: { title: series.log_scale ? `log10(${series.stat})` : series.stat }
+        }];
+    }
+
+    switch (chartType) {
+        case 'Bar':
+            return [{ x: series.x, y: series.y, type: 'bar', marker: { color: CHART_COLORS[0] } }];
+
+        case 'Pie':
+            return [{ labels: series.x, values: series.y, type: 'pie', marker: { colors: CHART_COLORS } }];
+
+        case 'Line':
+            return [{
+                x: series.x, y: series.y,
+                type: 'scatter',
+                mode: series.decimated ? 'lines' : 'lines+markers',
+                line: { color: CHART_COLORS[1], width: series.decimated ? 1 : 2 },
+                marker: { size: 4 }
+            }];
+
+        case 'Scatter':
+            return [{
+                x: series.x, y: series.y,
+                type: series.decimated ? 'scattergl' : 'scatter',
+                mode: 'markers',
+                marker: { color: CHART_COLORS[4], size: series.decimated ? 4 : 8, opacity: 0.7 }
+            }];
+
+        case 'Histogram':
+            return [{
+                x: series.counts.map((_, i) => (series.edges[i] + series.edges[i + 1]) / 2),
+                y: series.counts,
+                width: series.counts.map((_, i) => series.edges[i + 1] - series.edges[i]),
+                type: 'bar',
+                marker: { color: CHART_COLORS[2] }
+            }];
+
+        case 'Boxplot':
+            return [{
+                x: [xCol],
+                q1: [series.q1], median: [series.med], q3: [series.q3],
+                lowerfence: [series.whislo], upperfence: [series.whishi],
+                type: 'box',
+                name: xCol,
+                marker: { color: CHART_COLORS[3] }
+            }, {
+                x: series.fliers.map(() => xCol),
+                y: series.fliers,
+                type: 'scatter',
+                mode: 'markers',
+                marker: { color: CHART_COLORS[3], size: 4 },
+                showlegend: false
+            }];
+
+        case 'Heatmap':
+            return [{
+                z: series.z, x: series.x, y: series.y,
+                type: 'heatmap',
+                colorscale: 'RdBu',
+                zmin: -1,
+                zmax: 1
+            }];
+    }
+    return [];
+}
+
+async function plotServerChart(chartType, xCol, yCol) {
+    const request = ++chartRequest;
+    setStatus(`Computing ${chartType} chart on the server...`);
+
+    try {
+        const started = performance.now();
+        const series = await serverRequest(chartQuery(chartType, xCol, yCol));
+        if (request !== chartRequest) return;
+
+        const chartElement = document.getElementById('chart');
+        const traces = serverTraces(chartType, series, xCol);
+        const layout = { ...chartLayout(chartType, xCol), uirevision: `${chartType}|${xCol}|${yCol}` };
+        await Plotly.newPlot(chartElement, traces, layout, {
+            responsive: true,
+            displayModeBar: true,
+            displaylogo: false
+        });
+        currentChart = { data: traces, layout: layout };
+
+        chartElement.removeAllListeners('plotly_relayout');
+        if (series.decimated || series.density) {
+            chartElement.on('plotly_relayout', event => refineServerChart(event, chartType, xCol, yCol));
+        }
+        const points = series.decimated ? `, ${series.x.length.toLocaleString()} points drawn` : '';
+        setStatus(`Generated ${chartType} chart of ${series.rows.toLocaleString()} rows${points} ` +
+                  `in ${Math.round(performance.now() - started)} ms`);
+    } catch (error) {
+        alert('Error creating chart: ' + error.message);
+        setStatus('Chart generation failed');
+        console.error(error);
+    }
+}
+
+// After a zoom or pan, fetch the series again for the visible range so detail appears
+async function refineServerChart(event, chartType, xCol, yCol) {
+    if (!serverDataset) return;
+
+    const range = {};
+    if (event['xaxis.range[0]'] !== undefined) {
+        range.xmin = event['xaxis.range[0]'];
+        range.xmax = event['xaxis.range[1]'];
+    }
+    if (event['yaxis.range[0]'] !== undefined && chartType !== 'Line') {
+        range.ymin = event['yaxis.range[0]'];
+        range.ymax = event['yaxis.range[1]'];
+    }
+    if (!Object.keys(range).length && !event['xaxis.autorange']) return;
+
+    const request = ++chartRequest;
+    try {
+        const series = await serverRequest(chartQuery(chartType, xCol, yCol, range));
+        if (request !== chartRequest) return;
+
+        const chartElement = document.getElementById('chart');
+        Plotly.react(chartElement, serverTraces(chartType, series, xCol), chartElement.layout);
+        const points = series.decimated ? `${series.x.length.toLocaleString()} points` : 'density grid';
+        setStatus(`Refined ${chartType} chart for the visible range (${points})`);
+    } catch (error) {
+        setStatus(`Could not refine the chart: ${error.message}`);
+        console.error(error);
+    }
+}
+
 function getNumericColumns() {
     if (!currentData || currentData.length === 0) return [];
     
@@ -489,3 +747,5 @@ document.getElementById('fileInput').addEventListener('change', function() {
         setStatus(`File selected: ${this.files[0].name}. Click "Load Data File" to process.`);
     }
 });
+
+detectServer();